@@ -1,19 +1,76 @@
 """Database module for SQLite connection and table management."""
 
-import json
+import asyncio
+import hashlib
 import logging
-import aiosqlite
-from pathlib import Path
-from typing import Optional, Any
+import os
+import sqlite3
+import time
+import urllib.parse
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
-from datetime import datetime
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, AsyncGenerator, Iterable, Optional
+
+import aiosqlite
+import orjson
 
 logger = logging.getLogger(__name__)
 
 # Default database path - can be overridden for testing
 DATABASE_PATH = Path("data/database.db")
 
+# Per-connection tuning applied right after connecting. WAL lets readers proceed while
+# a writer commits; NORMAL sync is durable under WAL except on power loss.
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -65536",
+    # Checkpoint every 200 pages instead of 1000 so readers have less WAL to search
+    "PRAGMA wal_autocheckpoint = 200",
+)
+
+# Maximum number of read-only connections kept open per database
+READ_POOL_SIZE = os.cpu_count() or 1
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Free pages returned to the filesystem per incremental_vacuum run
+INCREMENTAL_VACUUM_PAGES = 100
+
+# Oldest SQLite library the schema works with: cache expiry uses unixepoch() (3.38.0)
+MIN_SQLITE_VERSION = (3, 38, 0)
+
+# Negative lookup cache for books without a status. Search pages mostly show books the
+# user hasn't saved, so repeat misses are answered without touching SQLite. Like the
+# status JSON cache below it is per process and only writes through this process clear
+# it, so it relies on the API running as a single worker; otherwise a book saved by
+# another worker can read as having no status for up to the TTL.
+MISS_CACHE_TTL_SECONDS = 60.0
+MISS_CACHE_MAX_ENTRIES = 10_000
+
+# Serialized JSON of recently read or written statuses, so a status GET can return bytes
+# without building and encoding a response model. Dropped whenever the status is written
+# through this process. The cache is per process and nothing tells it about writes made
+# by other processes, so the API is meant to run as a single worker (as the Dockerfile
+# does); with more workers a status GET can be up to the TTL out of date.
+STATUS_JSON_CACHE_TTL_SECONDS = 60.0
+STATUS_JSON_CACHE_MAX_ENTRIES = 10_000
+
+# Set to a one-element counter to count pooled connection checkouts in the current context;
+# used by the query-count debug middleware to spot requests making extra round trips
+db_checkouts: ContextVar[Optional[list[int]]] = ContextVar("db_checkouts", default=None)
+
+# Statuses are stored as small integers; the API keeps using the string values
+_STATUS_TO_INT = {"to_read": 0, "did_not_finish": 1, "completed": 2}
+_INT_TO_STATUS = {value: status for status, value in _STATUS_TO_INT.items()}
+
+# Directories already confirmed writable, so opening more connections skips the probe
+_checked_directories: set[Path] = set()
+
 
 class DatabaseError(Exception):
     """Raised when database operations fail."""
@@ -24,6 +81,9 @@ class DatabaseError(Exception):
 def ensure_database_directory(db_path: Path) -> None:
     """Ensure the database directory exists and is writable.
 
+    Each directory is only checked once per process, since every pooled connection
+    open would otherwise create and delete a probe file.
+
     Args:
         db_path: Path to the database file
 
@@ -31,6 +91,8 @@ def ensure_database_directory(db_path: Path) -> None:
         DatabaseError: If directory cannot be created or is not writable
     """
     directory = db_path.parent
+    if directory in _checked_directories:
+        return
     try:
         directory.mkdir(parents=True, exist_ok=True)
         # Test write permission by creating a temp file
@@ -43,28 +105,215 @@ def ensure_database_directory(db_path: Path) -> None:
         ) from e
     except OSError as e:
         raise DatabaseError(f"Cannot create database directory '{directory}': {e}") from e
+    _checked_directories.add(directory)
 
 
-@asynccontextmanager
-async def get_db_connection(
-    db_path: Optional[Path] = None,
-) -> AsyncGenerator[aiosqlite.Connection, None]:
-    """Get a database connection as a context manager.
+async def configure_connection(db: aiosqlite.Connection, db_path: Path) -> None:
+    """Apply journal mode and tuning PRAGMAs to a freshly opened connection.
 
-    Raises:
-        DatabaseError: If database connection fails
+    Args:
+        db: The connection to configure
+        db_path: Path the connection was opened against
     """
-    path = db_path or DATABASE_PATH
-    try:
-        # Ensure directory exists before connecting
+    # WAL needs a shared file on disk, so in-memory databases keep their default journal
+    if str(db_path) != ":memory:":
+        await db.execute("PRAGMA journal_mode = WAL")
+    for pragma in CONNECTION_PRAGMAS:
+        await db.execute(pragma)
+
+
+def cache_database_uri(db_path: Path) -> str:
+    """Build the URI of the in-memory database holding search_cache for db_path.
+
+    The search cache is disposable, so it lives in a shared-cache memory database
+    attached to every connection as cachedb. Its writes never reach the main file
+    or its WAL. The name is derived from db_path so each database gets its own cache.
+
+    Args:
+        db_path: Path to the main database file
+
+    Returns:
+        A SQLite URI filename for ATTACH
+    """
+    name = hashlib.sha1(str(db_path).encode()).hexdigest()[:16]
+    return f"file:search_cache_{name}?mode=memory&cache=shared"
+
+
+def database_uri(db_path: Path) -> str:
+    """Build the SQLite URI filename used to open db_path.
+
+    Connections are opened in URI mode so that the cachedb ATTACH is parsed as a URI
+    regardless of how the sqlite3 library was compiled.
+
+    Args:
+        db_path: Path to the main database file, or ':memory:'
+
+    Returns:
+        A SQLite URI filename with reserved characters in the path percent-escaped
+    """
+    if str(db_path) == ":memory:":
+        return "file::memory:"
+    return f"file:{urllib.parse.quote(str(db_path))}"
+
+
+# Schema of the in-memory search cache. It is created when the writer attaches cachedb,
+# since the memory database starts empty whenever no connection is holding it open.
+_SQL_CREATE_SEARCH_CACHE = """
+    CREATE TABLE IF NOT EXISTS cachedb.search_cache (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        query_hash TEXT UNIQUE NOT NULL,
+        query TEXT NOT NULL,
+        page INTEGER NOT NULL,
+        limit_val INTEGER NOT NULL,
+        response_json TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        expires_at INTEGER NOT NULL -- unix seconds
+    );
+    CREATE INDEX IF NOT EXISTS cachedb.idx_query_hash ON search_cache(query_hash);
+    CREATE INDEX IF NOT EXISTS cachedb.idx_expires_at ON search_cache(expires_at);
+"""
+
+
+async def _open_connection(path: Path, read_only: bool = False) -> aiosqlite.Connection:
+    """Open and configure a new connection to the database at path."""
+    if str(path) != ":memory:":
         ensure_database_directory(path)
-        db = await aiosqlite.connect(str(path))
-        # Enable foreign key support
-        await db.execute("PRAGMA foreign_keys = ON")
+    db = await aiosqlite.connect(
+        database_uri(path), uri=True, cached_statements=STATEMENT_CACHE_SIZE
+    )
+    await configure_connection(db, path)
+    await db.execute("ATTACH DATABASE ? AS cachedb", (cache_database_uri(path),))
+    if read_only:
+        await db.execute("PRAGMA query_only = ON")
+        # Shared-cache tables use table locks; don't let cache reads wait on the writer
+        await db.execute("PRAGMA read_uncommitted = ON")
+    else:
+        await db.executescript(_SQL_CREATE_SEARCH_CACHE)
+    return db
+
+
+class ConnectionPool:
+    """Long-lived connections to one database: a single writer and a pool of readers.
+
+    SQLite allows many concurrent readers but only one writer, so writes are
+    serialized on the writer connection while reads are spread across read-only
+    connections that are opened on demand up to read_pool_size.
+    """
+
+    def __init__(self, db_path: Path, read_pool_size: int = READ_POOL_SIZE) -> None:
+        self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        self.writer: Optional[aiosqlite.Connection] = None
+        self.write_lock = asyncio.Lock()
+        self._readers: list[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._reader_count = 0
+
+    async def open(self) -> None:
+        """Open the writer connection."""
+        self.writer = await _open_connection(self.db_path)
+
+    async def warm(self) -> None:
+        """Open readers until the pool is full so early requests don't pay for connecting."""
+        if str(self.db_path) == ":memory:":
+            return
+        while self._reader_count < self.read_pool_size:
+            self._idle_readers.put_nowait(await self._add_reader())
+
+    async def _add_reader(self) -> aiosqlite.Connection:
+        """Open a new read-only connection and count it against read_pool_size."""
+        # Reserve the slot before awaiting so concurrent callers don't overshoot
+        self._reader_count += 1
+        try:
+            db = await _open_connection(self.db_path, read_only=True)
+        except BaseException:
+            self._reader_count -= 1
+            raise
+        self._readers.append(db)
+        return db
+
+    async def close(self) -> None:
+        """Close the writer and every reader connection."""
+        readers, self._readers = self._readers, []
+        for db in readers:
+            await db.close()
+        if self.writer is not None:
+            await self.writer.close()
+            self.writer = None
+
+    @asynccontextmanager
+    async def read(self) -> AsyncGenerator[aiosqlite.Connection, None]:
+        """Borrow a read-only connection, opening a new one if none is idle."""
+        if str(self.db_path) == ":memory:":
+            # Every connection to :memory: is a separate database, so read via the writer
+            async with self.write() as db:
+                yield db
+            return
+
+        if self._idle_readers.empty() and self._reader_count < self.read_pool_size:
+            db = await self._add_reader()
+        else:
+            db = await self._idle_readers.get()
         try:
             yield db
         finally:
-            await db.close()
+            self._idle_readers.put_nowait(db)
+
+    @asynccontextmanager
+    async def write(self) -> AsyncGenerator[aiosqlite.Connection, None]:
+        """Hold the writer connection exclusively for the duration of the block."""
+        async with self.write_lock:
+            try:
+                yield self.writer
+            except BaseException:
+                # Leave the writer clean for the next caller
+                await self.writer.rollback()
+                raise
+
+
+# Connection pools keyed by database path
+_pools: dict[str, ConnectionPool] = {}
+
+
+async def get_pool(db_path: Optional[Path] = None) -> ConnectionPool:
+    """Return the connection pool for a database, opening it on first use."""
+    path = db_path or DATABASE_PATH
+    key = str(path)
+    pool = _pools.get(key)
+    if pool is None:
+        new_pool = ConnectionPool(path)
+        await new_pool.open()
+        # Another coroutine may have opened the same database while we were connecting
+        pool = _pools.setdefault(key, new_pool)
+        if pool is not new_pool:
+            await new_pool.close()
+    return pool
+
+
+async def warm_read_pool(db_path: Optional[Path] = None) -> None:
+    """Open every read connection for a database up front. Called on application startup.
+
+    Raises:
+        DatabaseError: If a connection cannot be opened
+    """
+    async with _translate_errors():
+        pool = await get_pool(db_path)
+        await pool.warm()
+
+
+async def close_db_connections() -> None:
+    """Close every pooled database connection. Called on application shutdown."""
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.close()
+
+
+@asynccontextmanager
+async def _translate_errors() -> AsyncGenerator[None, None]:
+    """Re-raise failures inside a database block as DatabaseError."""
+    try:
+        yield
     except DatabaseError:
         raise
     except aiosqlite.Error as e:
@@ -75,77 +324,436 @@ async def get_db_connection(
         raise DatabaseError(f"Unexpected database error: {e}") from e
 
 
+def _count_checkout() -> None:
+    """Increment the db_checkouts counter, if one is installed."""
+    counter = db_checkouts.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+@asynccontextmanager
+async def get_read_db(
+    db_path: Optional[Path] = None,
+) -> AsyncGenerator[aiosqlite.Connection, None]:
+    """Get a pooled read-only connection as a context manager.
+
+    Raises:
+        DatabaseError: If database connection fails
+    """
+    _count_checkout()
+    async with _translate_errors():
+        pool = await get_pool(db_path)
+        async with pool.read() as db:
+            yield db
+
+
+@asynccontextmanager
+async def get_write_db(
+    db_path: Optional[Path] = None,
+) -> AsyncGenerator[aiosqlite.Connection, None]:
+    """Get the writer connection as a context manager.
+
+    The writer is held exclusively for the duration of the block so statements and
+    commits from concurrent requests are not interleaved. A failed block is rolled back.
+
+    Raises:
+        DatabaseError: If database connection fails
+    """
+    _count_checkout()
+    async with _translate_errors():
+        pool = await get_pool(db_path)
+        async with pool.write() as db:
+            yield db
+
+
+@asynccontextmanager
+async def get_db_connection(
+    db_path: Optional[Path] = None,
+) -> AsyncGenerator[aiosqlite.Connection, None]:
+    """Get a read-write database connection as a context manager.
+
+    Equivalent to get_write_db, for callers that mix reads and writes.
+
+    Raises:
+        DatabaseError: If database connection fails
+    """
+    async with get_write_db(db_path) as db:
+        yield db
+
+
+# Schema for the books table. Each script runs in a single executescript() call, rather
+# than one execute() round trip per statement. Book statuses may need migrating in
+# between, so they get a script of their own.
+_SQL_CREATE_BOOKS_SCHEMA = """
+    -- The search cache now lives in the attached in-memory database; drop the old table
+    DROP TABLE IF EXISTS main.search_cache;
+
+    -- Books table - stores book metadata
+    CREATE TABLE IF NOT EXISTS books (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        openlibrary_work_key TEXT UNIQUE NOT NULL,
+        title TEXT NOT NULL,
+        author_name TEXT NOT NULL,
+        cover_url TEXT,
+        first_publish_year INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_books_openlibrary_work_key ON books(openlibrary_work_key);
+"""
+
+_SQL_CREATE_STATUS_SCHEMA = """
+    -- Book statuses table - stores reading status for each book (see _STATUS_TO_INT)
+    CREATE TABLE IF NOT EXISTS book_statuses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        book_id INTEGER NOT NULL UNIQUE REFERENCES books(id) ON DELETE CASCADE,
+        status INTEGER NOT NULL CHECK(status IN (0, 1, 2)),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_book_statuses_book_id ON book_statuses(book_id);
+    -- Covers the library-by-status listing: filter on status, already ordered by recency
+    DROP INDEX IF EXISTS idx_book_statuses_status;
+    DROP INDEX IF EXISTS idx_book_statuses_status_updated;
+    CREATE INDEX IF NOT EXISTS idx_book_statuses_status_recent
+        ON book_statuses(status, updated_at DESC, book_id DESC);
+    -- Same order without the status filter, for listing the whole library
+    CREATE INDEX IF NOT EXISTS idx_book_statuses_recent
+        ON book_statuses(updated_at DESC, book_id DESC);
+
+    -- Status counts table - per-status totals kept current by triggers on book_statuses
+    CREATE TABLE IF NOT EXISTS status_counts (
+        status INTEGER PRIMARY KEY,
+        n INTEGER NOT NULL DEFAULT 0
+    );
+    -- Seed any missing rows from the existing statuses so upgraded databases start correct
+    INSERT OR IGNORE INTO status_counts (status, n)
+    SELECT s.column1, (SELECT COUNT(*) FROM book_statuses WHERE status = s.column1)
+    FROM (VALUES (0), (1), (2)) s;
+    CREATE TRIGGER IF NOT EXISTS trg_status_counts_insert
+    AFTER INSERT ON book_statuses
+    BEGIN
+        UPDATE status_counts SET n = n + 1 WHERE status = NEW.status;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_status_counts_delete
+    AFTER DELETE ON book_statuses
+    BEGIN
+        UPDATE status_counts SET n = n - 1 WHERE status = OLD.status;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_status_counts_update
+    AFTER UPDATE OF status ON book_statuses
+    WHEN OLD.status <> NEW.status
+    BEGIN
+        UPDATE status_counts SET n = n - 1 WHERE status = OLD.status;
+        UPDATE status_counts SET n = n + 1 WHERE status = NEW.status;
+    END
+"""
+
+
 async def init_database(db_path: Optional[Path] = None) -> None:
-    """Initialize the database with required tables."""
-    async with get_db_connection(db_path) as db:
-        # Search cache table
-        await db.execute(
-            """
-            CREATE TABLE IF NOT EXISTS search_cache (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                query_hash TEXT UNIQUE NOT NULL,
-                query TEXT NOT NULL,
-                page INTEGER NOT NULL,
-                limit_val INTEGER NOT NULL,
-                response_json TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                expires_at TIMESTAMP NOT NULL
-            )
-        """
-        )
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_query_hash ON search_cache(query_hash)")
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_expires_at ON search_cache(expires_at)")
-
-        # Books table - stores book metadata
-        await db.execute(
-            """
-            CREATE TABLE IF NOT EXISTS books (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                openlibrary_work_key TEXT UNIQUE NOT NULL,
-                title TEXT NOT NULL,
-                author_name TEXT NOT NULL,
-                cover_url TEXT,
-                first_publish_year INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """
-        )
-        await db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_books_openlibrary_work_key ON books(openlibrary_work_key)"
+    """Initialize the database with required tables.
+
+    The first time this runs against a database created without incremental auto-vacuum
+    it rebuilds the whole file with VACUUM, which takes time and temporary disk space
+    in proportion to the database size. Later startups skip it.
+
+    Raises:
+        DatabaseError: If the SQLite library is older than MIN_SQLITE_VERSION
+    """
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        required = ".".join(map(str, MIN_SQLITE_VERSION))
+        raise DatabaseError(
+            f"SQLite {required} or newer is required, found {sqlite3.sqlite_version}"
         )
 
-        # Book statuses table - stores reading status for each book
-        await db.execute(
-            """
-            CREATE TABLE IF NOT EXISTS book_statuses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                book_id INTEGER NOT NULL UNIQUE REFERENCES books(id) ON DELETE CASCADE,
-                status TEXT NOT NULL CHECK(status IN ('to_read', 'did_not_finish', 'completed')),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    async with get_write_db(db_path) as db:
+        # Incremental auto-vacuum lets maintenance hand free pages back a few at a time.
+        # Switching to WAL has already written the header, so even a new database needs
+        # a one-off VACUUM for the mode to take effect.
+        cursor = await db.execute("PRAGMA auto_vacuum")
+        if (await cursor.fetchone())[0] != 2:
+            logger.info("Enabling incremental auto-vacuum")
+            await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            await db.execute("VACUUM")
+
+        await db.executescript(_SQL_CREATE_BOOKS_SCHEMA)
+        await _migrate_text_statuses(db)
+        # Writable view used by set_book_status and set_book_statuses_batch
+        await db.executescript(
+            ";\n".join(
+                (
+                    _SQL_CREATE_STATUS_SCHEMA,
+                    _SQL_CREATE_BOOK_STATUS_VIEW,
+                    _SQL_CREATE_BOOK_STATUS_TRIGGER,
+                )
             )
-        """
-        )
-        await db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_book_statuses_book_id ON book_statuses(book_id)"
-        )
-        await db.execute(
-            "CREATE INDEX IF NOT EXISTS idx_book_statuses_status ON book_statuses(status)"
         )
 
         await db.commit()
 
 
+async def _migrate_text_statuses(db: aiosqlite.Connection) -> None:
+    """Rebuild a book_statuses table created with TEXT statuses to use integer codes.
+
+    Dropping the old table also drops its indexes and count triggers, and status_counts
+    is dropped so init_database recreates and reseeds all of them afterwards.
+
+    Args:
+        db: The write connection init_database is running on
+    """
+    cursor = await db.execute(
+        "SELECT type FROM pragma_table_info('book_statuses') WHERE name = 'status'"
+    )
+    row = await cursor.fetchone()
+    if row is None or row[0] != "TEXT":
+        return
+
+    logger.info("Migrating book_statuses.status from TEXT to INTEGER")
+    # The view over book_statuses would block the rename below; init_database recreates it
+    await db.execute("DROP VIEW IF EXISTS v_book_status")
+    await db.execute("DROP TABLE IF EXISTS book_statuses_new")
+    await db.execute(
+        """
+        CREATE TABLE book_statuses_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_id INTEGER NOT NULL UNIQUE REFERENCES books(id) ON DELETE CASCADE,
+            status INTEGER NOT NULL CHECK(status IN (0, 1, 2)),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    )
+    await db.execute(
+        """
+        INSERT INTO book_statuses_new (id, book_id, status, created_at, updated_at)
+        SELECT bs.id, bs.book_id, m.value, bs.created_at, bs.updated_at
+        FROM book_statuses bs
+        JOIN json_each(?) m ON m.key = bs.status
+        """,
+        (orjson.dumps(_STATUS_TO_INT).decode(),),
+    )
+    await db.execute("DROP TABLE book_statuses")
+    await db.execute("ALTER TABLE book_statuses_new RENAME TO book_statuses")
+    await db.execute("DROP TABLE IF EXISTS status_counts")
+
+
 async def clear_expired_cache(db_path: Optional[Path] = None) -> int:
     """Remove expired cache entries. Returns the number of rows deleted."""
-    async with get_db_connection(db_path) as db:
-        cursor = await db.execute("DELETE FROM search_cache WHERE expires_at < datetime('now')")
+    async with get_write_db(db_path) as db:
+        cursor = await db.execute(
+            "DELETE FROM cachedb.search_cache WHERE expires_at <= unixepoch()"
+        )
         await db.commit()
         return cursor.rowcount
 
 
+# A cached search row together with the saved statuses of the books in it. Statuses are
+# keyed by work key, found by walking the docs array inside the cached JSON.
+_SQL_GET_CACHED_SEARCH = """
+    SELECT c.response_json, (
+        SELECT json_group_object(b.openlibrary_work_key, bs.status)
+        FROM json_each(CAST(c.response_json AS TEXT), '$.docs') d
+        JOIN books b ON b.openlibrary_work_key = json_extract(d.value, '$.key')
+        JOIN book_statuses bs ON bs.book_id = b.id
+    )
+    FROM cachedb.search_cache c
+    WHERE c.query_hash = ? AND c.expires_at > unixepoch()
+"""
+
+
+async def get_cached_search(
+    query_hash: str, db_path: Optional[Path] = None
+) -> Optional[tuple[bytes, dict[str, str]]]:
+    """Get an unexpired search_cache entry and the statuses of its books in one query.
+
+    Args:
+        query_hash: Cache key of the search
+        db_path: Optional database path for testing
+
+    Returns:
+        Tuple of the cached response JSON and a dict mapping work key to status string
+        for books in the response that have one, or None if there is no fresh entry
+    """
+    async with get_read_db(db_path) as db:
+        cursor = await db.execute(_SQL_GET_CACHED_SEARCH, (query_hash,))
+        row = await cursor.fetchone()
+    if row is None:
+        return None
+    statuses = {key: _INT_TO_STATUS[status] for key, status in orjson.loads(row[1]).items()}
+    return row[0], statuses
+
+
+async def incremental_vacuum(
+    db_path: Optional[Path] = None, pages: int = INCREMENTAL_VACUUM_PAGES
+) -> None:
+    """Release up to pages free pages from the database file."""
+    async with get_write_db(db_path) as db:
+        # The pragma frees one page per step and returns no rows, so execute() would stop
+        # after the first page; executescript() steps it to completion
+        await db.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+
+
+async def checkpoint_wal(db_path: Optional[Path] = None) -> None:
+    """Copy WAL frames back into the main database file without blocking readers."""
+    async with get_write_db(db_path) as db:
+        await db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+
 # Book and status operations
 
+# Statement text is shared module-level so every call hits the connection's statement cache
+_BOOK_STATUS_SELECT = """
+    SELECT b.openlibrary_work_key, b.title, b.author_name, b.cover_url,
+           b.first_publish_year, bs.status, bs.created_at, bs.updated_at
+    FROM books b
+    JOIN book_statuses bs ON b.id = bs.book_id
+"""
+_SQL_GET_BOOK_STATUS = _BOOK_STATUS_SELECT + "WHERE b.openlibrary_work_key = ?"
+# Timestamps have millisecond resolution, so newer books win ties between quick writes
+_LIBRARY_ORDER = "ORDER BY bs.updated_at DESC, bs.book_id DESC"
+_SQL_LIBRARY_SELECT = _BOOK_STATUS_SELECT + _LIBRARY_ORDER
+_SQL_LIBRARY_BY_STATUS = _BOOK_STATUS_SELECT + "WHERE bs.status = ? " + _LIBRARY_ORDER
+
+# Write timestamps are computed by SQLite (UTC, millisecond precision) so Python doesn't
+# build a datetime per write; 'now' is fixed for the duration of a statement
+_SQL_NOW = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+# Status writes go through the v_book_status view. Its INSTEAD OF trigger upserts the
+# book and then its status, so a write is one statement instead of two round trips.
+_SQL_CREATE_BOOK_STATUS_VIEW = "CREATE VIEW IF NOT EXISTS v_book_status AS" + _BOOK_STATUS_SELECT
+_SQL_CREATE_BOOK_STATUS_TRIGGER = f"""
+    CREATE TRIGGER IF NOT EXISTS trg_v_book_status_insert
+    INSTEAD OF INSERT ON v_book_status
+    BEGIN
+        INSERT INTO books
+            (openlibrary_work_key, title, author_name, cover_url, first_publish_year, created_at)
+        VALUES (
+            NEW.openlibrary_work_key, NEW.title, NEW.author_name, NEW.cover_url,
+            NEW.first_publish_year, {_SQL_NOW}
+        )
+        ON CONFLICT(openlibrary_work_key) DO UPDATE SET
+            title = excluded.title,
+            author_name = excluded.author_name,
+            cover_url = excluded.cover_url,
+            first_publish_year = excluded.first_publish_year;
+        INSERT INTO book_statuses (book_id, status, created_at, updated_at)
+        SELECT id, NEW.status, {_SQL_NOW}, {_SQL_NOW}
+        FROM books WHERE openlibrary_work_key = NEW.openlibrary_work_key
+        ON CONFLICT(book_id) DO UPDATE SET
+            status = excluded.status,
+            updated_at = excluded.updated_at;
+    END
+"""
+_SQL_SET_BOOK_STATUS = """
+    INSERT INTO v_book_status
+        (openlibrary_work_key, title, author_name, cover_url, first_publish_year, status)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+# Returns the written row in _BOOK_STATUS_SELECT column order, so set_book_status needs no
+# follow-up SELECT. Book columns echo the values written; the timestamps are set by the
+# trigger, so they are read back with subqueries, which see the trigger's changes.
+_SQL_SET_BOOK_STATUS_RETURNING = (
+    _SQL_SET_BOOK_STATUS
+    + """
+    RETURNING openlibrary_work_key, title, author_name, cover_url, first_publish_year, status,
+        (SELECT bs.created_at FROM books b JOIN book_statuses bs ON bs.book_id = b.id
+         WHERE b.openlibrary_work_key = v_book_status.openlibrary_work_key),
+        (SELECT bs.updated_at FROM books b JOIN book_statuses bs ON bs.book_id = b.id
+         WHERE b.openlibrary_work_key = v_book_status.openlibrary_work_key)
+"""
+)
+_SQL_GET_BOOK_STATUSES_BY_KEYS = (
+    _BOOK_STATUS_SELECT + "WHERE b.openlibrary_work_key IN (SELECT value FROM json_each(?))"
+)
+
+_SQL_GET_BOOK_ID = "SELECT id FROM books WHERE openlibrary_work_key = ?"
+_SQL_DELETE_STATUS = "DELETE FROM book_statuses WHERE book_id = ?"
+_SQL_DELETE_BOOK = "DELETE FROM books WHERE id = ?"
+
+# Keys are bound as one JSON array so the text is identical for every batch size
+_SQL_STATUSES_BATCH = """
+    SELECT b.openlibrary_work_key, bs.status
+    FROM json_each(?) j
+    JOIN books b ON b.openlibrary_work_key = j.value
+    JOIN book_statuses bs ON bs.book_id = b.id
+"""
+
+_SQL_STATUS_COUNTS = "SELECT status, n FROM status_counts"
+
+# Maps (database path, work key) to the monotonic time the cached miss expires
+_miss_cache: dict[tuple[str, str], float] = {}
+# Maps (database path, work key) to the monotonic expiry time and the status row as JSON
+_status_json_cache: dict[tuple[str, str], tuple[float, bytes]] = {}
+# Bumped on every status write so lookups that raced a write don't cache stale results
+_status_write_generation = 0
+
+
+def _status_key(openlibrary_work_key: str, db_path: Optional[Path]) -> tuple[str, str]:
+    """Build a status cache key, scoped to the database so test databases don't collide."""
+    return (str(db_path or DATABASE_PATH), openlibrary_work_key)
+
+
+def _remember_misses(
+    openlibrary_work_keys: Iterable[str], db_path: Optional[Path], generation: int
+) -> None:
+    """Record work keys known to have no status, unless a write happened meanwhile."""
+    if generation != _status_write_generation:
+        return
+    expires = time.monotonic() + MISS_CACHE_TTL_SECONDS
+    for openlibrary_work_key in openlibrary_work_keys:
+        key = _status_key(openlibrary_work_key, db_path)
+        # Re-insert so the dict stays ordered by insertion time for eviction
+        _miss_cache.pop(key, None)
+        _miss_cache[key] = expires
+    while len(_miss_cache) > MISS_CACHE_MAX_ENTRIES:
+        del _miss_cache[next(iter(_miss_cache))]
+
+
+def _remember_status_json(
+    openlibrary_work_key: str, db_path: Optional[Path], data: bytes, generation: int
+) -> None:
+    """Record the serialized status of a work key, unless a write happened meanwhile."""
+    if generation != _status_write_generation:
+        return
+    key = _status_key(openlibrary_work_key, db_path)
+    _status_json_cache.pop(key, None)
+    _status_json_cache[key] = (time.monotonic() + STATUS_JSON_CACHE_TTL_SECONDS, data)
+    while len(_status_json_cache) > STATUS_JSON_CACHE_MAX_ENTRIES:
+        del _status_json_cache[next(iter(_status_json_cache))]
+
+
+def _forget_status(openlibrary_work_key: str, db_path: Optional[Path]) -> None:
+    """Invalidate cached lookups for a work key whose status is being written.
+
+    Writers call this before writing and again after committing, since a read that ran
+    while the write was waiting for the lock may have cached the old state.
+    """
+    global _status_write_generation
+    _status_write_generation += 1
+    key = _status_key(openlibrary_work_key, db_path)
+    _miss_cache.pop(key, None)
+    _status_json_cache.pop(key, None)
+
+
+def _row_to_book(r: tuple) -> dict[str, Any]:
+    """Build a book/status dict from a row in _BOOK_STATUS_SELECT column order.
+
+    Args:
+        r: Raw row tuple
+
+    Returns:
+        Dictionary with book and status data, author_name and status decoded
+    """
+    return {
+        "openlibrary_work_key": r[0],
+        "title": r[1],
+        "author_name": orjson.loads(r[2]),
+        "cover_url": r[3],
+        "first_publish_year": r[4],
+        "status": _INT_TO_STATUS[r[5]],
+        "created_at": r[6],
+        "updated_at": r[7],
+    }
+
 
 async def get_book_status(
     openlibrary_work_key: str, db_path: Optional[Path] = None
@@ -159,25 +767,54 @@ async def get_book_status(
     Returns:
         Dictionary with book and status data or None if not found
     """
-    async with get_db_connection(db_path) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute(
-            """
-            SELECT b.openlibrary_work_key, b.title, b.author_name, b.cover_url, 
-                   b.first_publish_year, bs.status, bs.created_at, bs.updated_at
-            FROM books b
-            JOIN book_statuses bs ON b.id = bs.book_id
-            WHERE b.openlibrary_work_key = ?
-            """,
-            (openlibrary_work_key,),
-        )
+    if _miss_cache.get(_status_key(openlibrary_work_key, db_path), 0) > time.monotonic():
+        return None
+
+    generation = _status_write_generation
+    async with get_read_db(db_path) as db:
+        cursor = await db.execute(_SQL_GET_BOOK_STATUS, (openlibrary_work_key,))
         row = await cursor.fetchone()
         if row:
-            result = dict(row)
-            # Parse author_name from JSON string
-            result["author_name"] = json.loads(result["author_name"])
-            return result
+            return _row_to_book(row)
+    _remember_misses([openlibrary_work_key], db_path, generation)
+    return None
+
+
+async def get_book_status_json(
+    openlibrary_work_key: str, db_path: Optional[Path] = None
+) -> Optional[bytes]:
+    """Get the reading status for a book, serialized as JSON.
+
+    Args:
+        openlibrary_work_key: The OpenLibrary work key (e.g., '/works/OL123W')
+        db_path: Optional database path for testing
+
+    Returns:
+        JSON bytes of the book and status data or None if not found
+    """
+    cached = _status_json_cache.get(_status_key(openlibrary_work_key, db_path))
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    generation = _status_write_generation
+    book = await get_book_status(openlibrary_work_key, db_path)
+    if book is None:
         return None
+    data = orjson.dumps(book)
+    _remember_status_json(openlibrary_work_key, db_path, data, generation)
+    return data
+
+
+def _status_to_int(status: str) -> int:
+    """Map a status string to its stored code, rejecting unknown statuses before any query.
+
+    Raises:
+        DatabaseError: If status is not a known reading status
+    """
+    code = _STATUS_TO_INT.get(status)
+    if code is None:
+        raise DatabaseError(f"Invalid book status: {status!r}")
+    return code
 
 
 async def set_book_status(
@@ -202,63 +839,88 @@ async def set_book_status(
 
     Returns:
         Dictionary with the updated book and status data
+
+    Raises:
+        DatabaseError: If status is invalid or the write fails
     """
-    now = datetime.utcnow().isoformat()
-    author_name_json = json.dumps(author_name)
-
-    async with get_db_connection(db_path) as db:
-        db.row_factory = aiosqlite.Row
-
-        # Insert or update the book
-        await db.execute(
-            """
-            INSERT INTO books (openlibrary_work_key, title, author_name, cover_url, first_publish_year, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(openlibrary_work_key) DO UPDATE SET
-                title = excluded.title,
-                author_name = excluded.author_name,
-                cover_url = excluded.cover_url,
-                first_publish_year = excluded.first_publish_year
-            """,
-            (openlibrary_work_key, title, author_name_json, cover_url, first_publish_year, now),
-        )
+    status_code = _status_to_int(status)
+    author_name_json = orjson.dumps(author_name).decode()
 
-        # Get the book ID
+    _forget_status(openlibrary_work_key, db_path)
+    async with get_write_db(db_path) as db:
+        # Insert or update the book and its status and read the row back in one statement
         cursor = await db.execute(
-            "SELECT id FROM books WHERE openlibrary_work_key = ?",
-            (openlibrary_work_key,),
+            _SQL_SET_BOOK_STATUS_RETURNING,
+            (
+                openlibrary_work_key,
+                title,
+                author_name_json,
+                cover_url,
+                first_publish_year,
+                status_code,
+            ),
         )
-        book_row = await cursor.fetchone()
-        book_id = book_row["id"]
-
-        # Insert or update the status
-        await db.execute(
-            """
-            INSERT INTO book_statuses (book_id, status, created_at, updated_at)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(book_id) DO UPDATE SET
-                status = excluded.status,
-                updated_at = excluded.updated_at
-            """,
-            (book_id, status, now, now),
+        row = await cursor.fetchone()
+        await db.commit()
+    _forget_status(openlibrary_work_key, db_path)
+
+    book = _row_to_book(row)
+    # Serialize now so the next GET for this book is answered from memory
+    _remember_status_json(
+        openlibrary_work_key, db_path, orjson.dumps(book), _status_write_generation
+    )
+    return book
+
+
+async def set_book_statuses_batch(
+    items: list[dict[str, Any]], db_path: Optional[Path] = None
+) -> list[dict[str, Any]]:
+    """Set or update reading statuses for many books in a single transaction.
+
+    Args:
+        items: Dictionaries with openlibrary_work_key, status, title and author_name,
+            plus optional cover_url and first_publish_year
+        db_path: Optional database path for testing
+
+    Returns:
+        List of dictionaries with the updated book and status data, one per distinct
+        work key in input order. If a key repeats, its last item wins.
+
+    Raises:
+        DatabaseError: If any status is invalid, in which case nothing is written
+    """
+    if not items:
+        return []
+
+    params = [
+        (
+            item["openlibrary_work_key"],
+            item["title"],
+            orjson.dumps(item["author_name"]).decode(),
+            item.get("cover_url"),
+            item.get("first_publish_year"),
+            _status_to_int(item["status"]),
         )
+        for item in items
+    ]
+    work_keys = [item["openlibrary_work_key"] for item in items]
+
+    for openlibrary_work_key in work_keys:
+        _forget_status(openlibrary_work_key, db_path)
+    async with get_write_db(db_path) as db:
+        # One commit for the whole batch instead of one per book
+        await db.executemany(_SQL_SET_BOOK_STATUS, params)
         await db.commit()
+        for openlibrary_work_key in work_keys:
+            _forget_status(openlibrary_work_key, db_path)
 
-        # Return the full book with status
         cursor = await db.execute(
-            """
-            SELECT b.openlibrary_work_key, b.title, b.author_name, b.cover_url, 
-                   b.first_publish_year, bs.status, bs.created_at, bs.updated_at
-            FROM books b
-            JOIN book_statuses bs ON b.id = bs.book_id
-            WHERE b.openlibrary_work_key = ?
-            """,
-            (openlibrary_work_key,),
+            _SQL_GET_BOOK_STATUSES_BY_KEYS, (orjson.dumps(work_keys).decode(),)
         )
-        row = await cursor.fetchone()
-        result = dict(row)
-        result["author_name"] = json.loads(result["author_name"])
-        return result
+        rows = await cursor.fetchall()
+    # Rows come back in index order; put them back in the order the keys were given
+    books = {r[0]: _row_to_book(r) for r in rows}
+    return [books[key] for key in dict.fromkeys(work_keys)]
 
 
 async def delete_book_status(openlibrary_work_key: str, db_path: Optional[Path] = None) -> bool:
@@ -271,12 +933,10 @@ async def delete_book_status(openlibrary_work_key: str, db_path: Optional[Path]
     Returns:
         True if a status was deleted, False if no status existed
     """
-    async with get_db_connection(db_path) as db:
+    _forget_status(openlibrary_work_key, db_path)
+    async with get_write_db(db_path) as db:
         # Get book ID first
-        cursor = await db.execute(
-            "SELECT id FROM books WHERE openlibrary_work_key = ?",
-            (openlibrary_work_key,),
-        )
+        cursor = await db.execute(_SQL_GET_BOOK_ID, (openlibrary_work_key,))
         row = await cursor.fetchone()
         if not row:
             return False
@@ -284,19 +944,14 @@ async def delete_book_status(openlibrary_work_key: str, db_path: Optional[Path]
         book_id = row[0]
 
         # Delete the status
-        cursor = await db.execute(
-            "DELETE FROM book_statuses WHERE book_id = ?",
-            (book_id,),
-        )
+        cursor = await db.execute(_SQL_DELETE_STATUS, (book_id,))
         status_deleted = cursor.rowcount > 0
 
         # Delete the book (since it's now orphaned - no status references it)
-        await db.execute(
-            "DELETE FROM books WHERE id = ?",
-            (book_id,),
-        )
+        await db.execute(_SQL_DELETE_BOOK, (book_id,))
 
         await db.commit()
+        _forget_status(openlibrary_work_key, db_path)
         return status_deleted
 
 
@@ -311,55 +966,47 @@ async def get_all_book_statuses(
     Returns:
         List of dictionaries with book and status data
     """
-    async with get_db_connection(db_path) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute(
-            """
-            SELECT b.openlibrary_work_key, b.title, b.author_name, b.cover_url, 
-                   b.first_publish_year, bs.status, bs.created_at, bs.updated_at
-            FROM books b
-            JOIN book_statuses bs ON b.id = bs.book_id
-            ORDER BY bs.updated_at DESC
-            """
-        )
+    async with get_read_db(db_path) as db:
+        cursor = await db.execute(_SQL_LIBRARY_SELECT)
         rows = await cursor.fetchall()
-        results = []
-        for row in rows:
-            result = dict(row)
-            result["author_name"] = json.loads(result["author_name"])
-            results.append(result)
-        return results
+    # Decode after the reader is back in the pool so other requests aren't kept waiting
+    return [_row_to_book(r) for r in rows]
 
 
 async def get_book_statuses_batch(
-    openlibrary_work_keys: list[str], db_path: Optional[Path] = None
+    openlibrary_work_keys: Iterable[str], db_path: Optional[Path] = None
 ) -> dict[str, str]:
     """Get reading statuses for multiple books in a single query.
 
+    The keys are bound as one JSON array, so any number of them costs one statement.
+
     Args:
-        openlibrary_work_keys: List of OpenLibrary work keys
+        openlibrary_work_keys: OpenLibrary work keys, in any iterable
         db_path: Optional database path for testing
 
     Returns:
         Dictionary mapping openlibrary_work_key to status string
     """
+    # Skip keys already known to have no status; a page of unsaved books needs no query
+    now = time.monotonic()
+    openlibrary_work_keys = [
+        key for key in openlibrary_work_keys if _miss_cache.get(_status_key(key, db_path), 0) <= now
+    ]
     if not openlibrary_work_keys:
         return {}
 
-    async with get_db_connection(db_path) as db:
-        db.row_factory = aiosqlite.Row
-        placeholders = ",".join("?" * len(openlibrary_work_keys))
+    generation = _status_write_generation
+    async with get_read_db(db_path) as db:
         cursor = await db.execute(
-            f"""
-            SELECT b.openlibrary_work_key, bs.status 
-            FROM books b
-            JOIN book_statuses bs ON b.id = bs.book_id
-            WHERE b.openlibrary_work_key IN ({placeholders})
-            """,
-            openlibrary_work_keys,
+            _SQL_STATUSES_BATCH, (orjson.dumps(openlibrary_work_keys).decode(),)
         )
         rows = await cursor.fetchall()
-        return {row["openlibrary_work_key"]: row["status"] for row in rows}
+
+    statuses = {key: _INT_TO_STATUS[status] for key, status in rows}
+    _remember_misses(
+        (key for key in openlibrary_work_keys if key not in statuses), db_path, generation
+    )
+    return statuses
 
 
 async def get_books_by_status(status: str, db_path: Optional[Path] = None) -> list[dict[str, Any]]:
@@ -372,26 +1019,11 @@ async def get_books_by_status(status: str, db_path: Optional[Path] = None) -> li
     Returns:
         List of dictionaries with book and status data
     """
-    async with get_db_connection(db_path) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute(
-            """
-            SELECT b.openlibrary_work_key, b.title, b.author_name, b.cover_url, 
-                   b.first_publish_year, bs.status, bs.created_at, bs.updated_at
-            FROM books b
-            JOIN book_statuses bs ON b.id = bs.book_id
-            WHERE bs.status = ?
-            ORDER BY bs.updated_at DESC
-            """,
-            (status,),
-        )
+    async with get_read_db(db_path) as db:
+        cursor = await db.execute(_SQL_LIBRARY_BY_STATUS, (_STATUS_TO_INT.get(status),))
         rows = await cursor.fetchall()
-        results = []
-        for row in rows:
-            result = dict(row)
-            result["author_name"] = json.loads(result["author_name"])
-            results.append(result)
-        return results
+    # Decode after the reader is back in the pool so other requests aren't kept waiting
+    return [_row_to_book(r) for r in rows]
 
 
 async def get_status_counts(db_path: Optional[Path] = None) -> dict[str, int]:
@@ -403,18 +1035,12 @@ async def get_status_counts(db_path: Optional[Path] = None) -> dict[str, int]:
     Returns:
         Dictionary mapping status to count
     """
-    async with get_db_connection(db_path) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute(
-            """
-            SELECT status, COUNT(*) as count
-            FROM book_statuses
-            GROUP BY status
-            """
-        )
+    async with get_read_db(db_path) as db:
+        # Totals are maintained by triggers, so this is a lookup rather than a table scan
+        cursor = await db.execute(_SQL_STATUS_COUNTS)
         rows = await cursor.fetchall()
-        # Initialize with zeros
-        counts = {"to_read": 0, "did_not_finish": 0, "completed": 0}
-        for row in rows:
-            counts[row["status"]] = row["count"]
-        return counts
+    # Initialize with zeros
+    counts = dict.fromkeys(_STATUS_TO_INT, 0)
+    for status, n in rows:
+        counts[_INT_TO_STATUS[status]] = n
+    return counts
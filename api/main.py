@@ -1,27 +1,101 @@
 """Main FastAPI application."""
 
+import asyncio
+import hashlib
+import logging
+import os
+import time
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
 
-from api.database import init_database
+from api.database import (
+    DatabaseError,
+    checkpoint_wal,
+    clear_expired_cache,
+    close_db_connections,
+    db_checkouts,
+    incremental_vacuum,
+    init_database,
+    warm_read_pool,
+)
 from api.routes.books import router as books_router
-from api.routes.status import router as status_router
 from api.routes.library import router as library_router
+from api.routes.status import router as status_router
+from api.services.cache import close_cache_backend, init_cache_backend
+from api.services.openlibrary import close_http_client
+
+logger = logging.getLogger(__name__)
+
+# How often expired search cache rows are purged, in seconds
+CACHE_GC_INTERVAL_SECONDS = 60
+# How often free pages are vacuumed and the WAL is checkpointed back into the main
+# database file, in seconds
+WAL_CHECKPOINT_INTERVAL_SECONDS = 300
+
+# Set NEE_READS_DEBUG_QUERIES=1 to log requests that check out more than
+# MAX_DB_CHECKOUTS_PER_REQUEST database connections (an N+1 query smell)
+DEBUG_QUERIES = os.environ.get("NEE_READS_DEBUG_QUERIES") == "1"
+MAX_DB_CHECKOUTS_PER_REQUEST = 2
+
+# Vite puts a content hash in every /assets filename, so a given URL never changes
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+async def database_maintenance_loop() -> None:
+    """Purge expired cache rows, vacuum free pages and checkpoint the WAL on a schedule.
+
+    Running these from one background task batches cache deletes into a single commit
+    per interval instead of paying for them on the request path.
+    """
+    last_checkpoint = time.monotonic()
+    while True:
+        await asyncio.sleep(CACHE_GC_INTERVAL_SECONDS)
+        try:
+            await clear_expired_cache()
+            if time.monotonic() - last_checkpoint >= WAL_CHECKPOINT_INTERVAL_SECONDS:
+                await incremental_vacuum()
+                await checkpoint_wal()
+                last_checkpoint = time.monotonic()
+        except DatabaseError as e:
+            logger.error(f"Database maintenance failed: {e}")
+        except Exception as e:
+            # Keep the loop alive; cancellation is a BaseException and still stops it
+            logger.exception(f"Unexpected error during database maintenance: {e}")
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for content-hashed build assets, served with a long immutable cache."""
+
+    def file_response(self, *args: Any, **kwargs: Any) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan handler - runs on startup and shutdown."""
-    # Startup: Initialize database
+    # Startup: Initialize database (this also opens the connection pool)
     await init_database()
+    await warm_read_pool()
+    await init_cache_backend()
+    maintenance = asyncio.create_task(database_maintenance_loop())
     yield
-    # Shutdown: Nothing to clean up
+    # Shutdown: Stop maintenance and close pooled database connections
+    maintenance.cancel()
+    try:
+        await maintenance
+    except asyncio.CancelledError:
+        pass
+    await close_http_client()
+    await close_cache_backend()
+    await close_db_connections()
 
 
 def create_app() -> FastAPI:
@@ -42,6 +116,23 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if DEBUG_QUERIES:
+
+        @app.middleware("http")
+        async def warn_on_extra_queries(request: Request, call_next: Any) -> Response:
+            """Log requests that make more database round trips than expected."""
+            counter = [0]
+            token = db_checkouts.set(counter)
+            try:
+                response = await call_next(request)
+            finally:
+                db_checkouts.reset(token)
+            if counter[0] > MAX_DB_CHECKOUTS_PER_REQUEST:
+                logger.warning(
+                    f"{request.method} {request.url.path} used {counter[0]} database connections"
+                )
+            return response
+
     # Include API routes
     app.include_router(books_router)
     app.include_router(status_router)
@@ -50,20 +141,42 @@ def create_app() -> FastAPI:
     # Serve static files in production
     static_path = Path(__file__).parent.parent / "web" / "dist"
     if static_path.exists():
-        app.mount("/assets", StaticFiles(directory=static_path / "assets"), name="assets")
+        app.mount("/assets", ImmutableStaticFiles(directory=static_path / "assets"), name="assets")
+
+        # index.html only changes on deploy, so read it once and serve it from memory.
+        # no-cache makes browsers revalidate, which the ETag turns into a cheap 304.
+        index_bytes = (static_path / "index.html").read_bytes()
+        index_etag = f'"{hashlib.sha1(index_bytes).hexdigest()}"'
+        index_headers = {"Cache-Control": "no-cache", "ETag": index_etag}
+
+        def index_response(request: Request) -> Response:
+            if request.headers.get("if-none-match") == index_etag:
+                return Response(status_code=304, headers=index_headers)
+            return Response(index_bytes, media_type="text/html", headers=index_headers)
 
         @app.get("/")
-        async def serve_index() -> FileResponse:
+        async def serve_index(request: Request) -> Response:
             """Serve the main index.html for the SPA."""
-            return FileResponse(static_path / "index.html")
+            return index_response(request)
+
+        # The build output is fixed for the life of the process, so resolve SPA
+        # routes with a dict lookup instead of probing the filesystem per request.
+        static_files = {
+            file_path.relative_to(static_path).as_posix(): file_path
+            for file_path in static_path.rglob("*")
+            if file_path.is_file()
+        }
 
         @app.get("/{path:path}")
-        async def serve_spa(path: str) -> FileResponse:
+        async def serve_spa(path: str, request: Request) -> Response:
             """Serve index.html for all unmatched routes (SPA routing)."""
-            file_path = static_path / path
-            if file_path.exists() and file_path.is_file():
+            # Unknown API paths are client errors, not SPA pages
+            if path == "api" or path.startswith("api/"):
+                raise HTTPException(status_code=404, detail="Not Found")
+            file_path = static_files.get(path)
+            if file_path is not None:
                 return FileResponse(file_path)
-            return FileResponse(static_path / "index.html")
+            return index_response(request)
 
     return app
 
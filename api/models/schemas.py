@@ -3,7 +3,10 @@
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# OpenLibrary work keys, with or without the leading slash ('/works/OL123W')
+WORK_KEY_PATTERN = r"^/?works/OL[0-9]+W$"
 
 
 class ReadingStatus(str, Enum):
@@ -17,6 +20,8 @@ class ReadingStatus(str, Enum):
 class Book(BaseModel):
     """Book model representing a book from search results."""
 
+    model_config = ConfigDict(from_attributes=True, validate_default=False)
+
     openlibrary_work_key: str = Field(
         ..., description="OpenLibrary work key (e.g., '/works/OL123W')"
     )
@@ -27,6 +32,14 @@ class Book(BaseModel):
     status: Optional[ReadingStatus] = Field(None, description="Reading status if set")
 
 
+class SearchParams(BaseModel):
+    """Query parameters for book search."""
+
+    q: str = Field(..., min_length=1, description="Search query")
+    page: int = Field(1, ge=1, description="Page number")
+    limit: int = Field(100, ge=1, le=100, description="Results per page")
+
+
 class SearchResponse(BaseModel):
     """Response model for book search endpoint."""
 
@@ -58,6 +71,8 @@ class BookStatusRequest(BaseModel):
 class BookStatusResponse(BaseModel):
     """Response model for book status with full book metadata."""
 
+    model_config = ConfigDict(from_attributes=True, validate_default=False)
+
     openlibrary_work_key: str = Field(..., description="OpenLibrary work key")
     title: str = Field(..., description="Book title")
     author_name: list[str] = Field(..., description="List of author names")
@@ -76,12 +91,39 @@ class BookStatusListResponse(BaseModel):
     )
 
 
+class BookStatusBatchItem(BookStatusRequest):
+    """Request model for one book in a batch status update."""
+
+    openlibrary_work_key: str = Field(
+        ..., pattern=WORK_KEY_PATTERN, description="OpenLibrary work key (e.g., '/works/OL123W')"
+    )
+
+
+class BookStatusBatchRequest(BaseModel):
+    """Request model for setting the status of several books at once."""
+
+    books: list[BookStatusBatchItem] = Field(
+        ..., min_length=1, description="Books to set the status for"
+    )
+
+    @field_validator("books")
+    @classmethod
+    def reject_duplicate_keys(cls, books: list[BookStatusBatchItem]) -> list[BookStatusBatchItem]:
+        """Reject batches that list the same work key twice, with or without its slash."""
+        keys = [book.openlibrary_work_key.lstrip("/") for book in books]
+        if len(set(keys)) != len(keys):
+            raise ValueError("Each work key may appear only once per batch")
+        return books
+
+
 # Library models
 
 
 class LibraryBook(BaseModel):
     """Book model for library responses (with status always present)."""
 
+    model_config = ConfigDict(from_attributes=True, validate_default=False)
+
     openlibrary_work_key: str = Field(..., description="OpenLibrary work key")
     title: str = Field(..., description="Book title")
     author_name: list[str] = Field(..., description="List of author names")
@@ -1,27 +1,35 @@
 """Book search route handlers."""
 
 import logging
-from fastapi import APIRouter, HTTPException, Query
+from typing import Annotated, Optional
 
-from api.models.schemas import SearchResponse, ErrorResponse, ReadingStatus
-from api.services.cache import get_cached_response, store_cached_response
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+
+from api.database import DatabaseError, get_book_statuses_batch
+from api.models.schemas import ErrorResponse, ReadingStatus, SearchParams, SearchResponse
+from api.services.cache import get_cached_search, store_cached_response
 from api.services.openlibrary import (
-    search_books,
-    parse_search_response,
     OpenLibraryError,
+    parse_search_response,
+    search_books,
 )
-from api.database import get_book_statuses_batch, DatabaseError
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/books", tags=["books"])
 
+# Status values to enum members; indexing a dict is much cheaper than calling the Enum
+_STATUS_BY_VALUE = {status.value: status for status in ReadingStatus}
 
-async def enrich_books_with_status(response: SearchResponse) -> SearchResponse:
+
+async def enrich_books_with_status(
+    response: SearchResponse, statuses: Optional[dict[str, str]] = None
+) -> SearchResponse:
     """Add reading status to books from the database.
 
     Args:
         response: SearchResponse with books to enrich
+        statuses: Statuses already read alongside the response; looked up if None
 
     Returns:
         SearchResponse with status field populated for books that have a status
@@ -29,25 +37,43 @@ async def enrich_books_with_status(response: SearchResponse) -> SearchResponse:
     if not response.books:
         return response
 
-    # Get all book keys
-    book_keys = [book.openlibrary_work_key for book in response.books]
+    if statuses is None:
+        # Get all book keys
+        book_keys = [book.openlibrary_work_key for book in response.books]
 
-    # Fetch statuses in a single batch query
-    # If database fails, log error but don't break search - just return books without status
-    try:
-        statuses = await get_book_statuses_batch(book_keys)
-    except DatabaseError as e:
-        logger.error(f"Failed to fetch book statuses: {e}")
+        # Fetch statuses in a single batch query
+        # If database fails, log error but don't break search - just return books without status
+        try:
+            statuses = await get_book_statuses_batch(book_keys)
+        except DatabaseError as e:
+            logger.error(f"Failed to fetch book statuses: {e}")
+            return response
+
+    # Most searches contain no saved books, so skip the second pass entirely
+    if not statuses:
         return response
 
     # Update books with their status
+    get_status = statuses.get
     for book in response.books:
-        if book.openlibrary_work_key in statuses:
-            book.status = ReadingStatus(statuses[book.openlibrary_work_key])
+        status = get_status(book.openlibrary_work_key)
+        if status is not None:
+            book.status = _STATUS_BY_VALUE[status]
 
     return response
 
 
+async def store_in_background(query: str, page: int, limit: int, raw_response: dict) -> None:
+    """Store a search response in the cache after the response has been sent.
+
+    Failures are logged rather than raised, since the client already has its results.
+    """
+    try:
+        await store_cached_response(query, page, limit, raw_response)
+    except DatabaseError as e:
+        logger.error(f"Failed to cache search response: {e}")
+
+
 @router.get(
     "/search",
     response_model=SearchResponse,
@@ -58,25 +84,26 @@ async def enrich_books_with_status(response: SearchResponse) -> SearchResponse:
     },
 )
 async def search(
-    q: str = Query(..., min_length=1, description="Search query"),
-    page: int = Query(1, ge=1, description="Page number"),
-    limit: int = Query(100, ge=1, le=100, description="Results per page"),
+    background_tasks: BackgroundTasks,
+    params: Annotated[SearchParams, Query()],
 ) -> SearchResponse:
     """Search for books by title or author.
 
     Args:
-        q: Search query string
-        page: Page number (1-indexed)
-        limit: Number of results per page (max 100)
+        background_tasks: Tasks run after the response is sent
+        params: Search query, page number (1-indexed) and results per page (max 100)
 
     Returns:
         SearchResponse with list of books and pagination info
     """
-    # Check cache first
-    cached_response = await get_cached_response(q, page, limit)
-    if cached_response:
+    q, page, limit = params.q, params.page, params.limit
+
+    # Check cache first; a SQLite hit also brings back the statuses of its books
+    cached = await get_cached_search(q, page, limit)
+    if cached:
+        cached_response, statuses = cached
         response = parse_search_response(cached_response, page, limit)
-        return await enrich_books_with_status(response)
+        return await enrich_books_with_status(response, statuses)
 
     # Fetch from OpenLibrary API
     try:
@@ -89,8 +116,10 @@ async def search(
         else:
             raise HTTPException(status_code=502, detail=e.message)
 
-    # Store in cache
-    await store_cached_response(q, page, limit, raw_response)
+    # Store in cache once the response is on its way, off the critical path. This already
+    # overlaps the write with the status lookup below without making the client wait on it,
+    # which gathering the two would.
+    background_tasks.add_task(store_in_background, q, page, limit, raw_response)
 
     response = parse_search_response(raw_response, page, limit)
     return await enrich_books_with_status(response)
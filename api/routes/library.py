@@ -1,17 +1,17 @@
 """Library route handlers."""
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, HTTPException, Response
 
+from api.database import (
+    get_books_by_status,
+    get_status_counts,
+)
 from api.models.schemas import (
+    ErrorResponse,
     LibraryBook,
     LibraryResponse,
     StatusCountsResponse,
-    ReadingStatus,
-    ErrorResponse,
-)
-from api.database import (
-    get_books_by_status,
-    get_status_counts,
 )
 
 router = APIRouter(prefix="/api/library", tags=["library"])
@@ -24,24 +24,22 @@ STATUS_SLUG_MAP = {
     "completed": "completed",
 }
 
+# Fields of each library book in the response; rows also carry timestamps that are dropped
+_LIBRARY_BOOK_FIELDS = tuple(LibraryBook.model_fields)
+
 
 @router.get(
     "/counts",
     response_model=StatusCountsResponse,
     summary="Get book counts by status",
 )
-async def get_counts() -> StatusCountsResponse:
+async def get_counts() -> dict[str, int]:
     """Get the count of books in each reading status category.
 
     Returns:
         StatusCountsResponse with counts for each status
     """
-    counts = await get_status_counts()
-    return StatusCountsResponse(
-        to_read=counts["to_read"],
-        did_not_finish=counts["did_not_finish"],
-        completed=counts["completed"],
-    )
+    return await get_status_counts()
 
 
 @router.get(
@@ -52,9 +50,12 @@ async def get_counts() -> StatusCountsResponse:
     },
     summary="Get books by status",
 )
-async def get_library_books(status: str) -> LibraryResponse:
+async def get_library_books(status: str) -> Response:
     """Get all books with a specific reading status.
 
+    Rows come from our own database, so the body is encoded directly instead of
+    validating every book against response_model; large libraries make that the main cost.
+
     Args:
         status: The reading status slug ('to-read', 'did-not-finish', 'completed')
 
@@ -71,17 +72,8 @@ async def get_library_books(status: str) -> LibraryResponse:
 
     books = await get_books_by_status(db_status)
 
-    return LibraryResponse(
-        books=[
-            LibraryBook(
-                openlibrary_work_key=book["openlibrary_work_key"],
-                title=book["title"],
-                author_name=book["author_name"],
-                cover_url=book["cover_url"],
-                first_publish_year=book["first_publish_year"],
-                status=ReadingStatus(book["status"]),
-            )
-            for book in books
-        ],
-        total=len(books),
-    )
+    body = {
+        "books": [{field: book[field] for field in _LIBRARY_BOOK_FIELDS} for book in books],
+        "total": len(books),
+    }
+    return Response(content=orjson.dumps(body), media_type="application/json")
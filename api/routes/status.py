@@ -1,21 +1,25 @@
 """Book status route handlers."""
 
 import logging
-from fastapi import APIRouter, HTTPException, Path
+from typing import Any
 
+from fastapi import APIRouter, HTTPException, Path, Response
+from starlette.convertors import Convertor, register_url_convertor
+
+from api.database import (
+    DatabaseError,
+    delete_book_status,
+    get_all_book_statuses,
+    get_book_status_json,
+    set_book_status,
+    set_book_statuses_batch,
+)
 from api.models.schemas import (
+    BookStatusBatchRequest,
+    BookStatusListResponse,
     BookStatusRequest,
     BookStatusResponse,
-    BookStatusListResponse,
     ErrorResponse,
-    ReadingStatus,
-)
-from api.database import (
-    get_book_status,
-    set_book_status,
-    delete_book_status,
-    get_all_book_statuses,
-    DatabaseError,
 )
 
 logger = logging.getLogger(__name__)
@@ -23,6 +27,26 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/status", tags=["status"])
 
 
+class WorkKeyConvertor(Convertor):
+    """Match OpenLibrary work keys (works/OL123W) in a URL path.
+
+    Only the work key shape is accepted, so other paths fail routing without running
+    the handler. The converted value has its leading slash restored ('/works/OL123W').
+    """
+
+    regex = "works/OL[0-9]+W"
+
+    def convert(self, value: str) -> str:
+        return f"/{value}"
+
+    def to_string(self, value: str) -> str:
+        return value.lstrip("/")
+
+
+# Must run at import, before the route decorators below compile their path patterns
+register_url_convertor("work_key", WorkKeyConvertor())
+
+
 @router.get(
     "",
     response_model=BookStatusListResponse,
@@ -31,7 +55,7 @@ router = APIRouter(prefix="/api/status", tags=["status"])
         500: {"model": ErrorResponse, "description": "Database error"},
     },
 )
-async def list_statuses() -> BookStatusListResponse:
+async def list_statuses() -> dict[str, Any]:
     """Get all book reading statuses.
 
     Returns:
@@ -39,28 +63,51 @@ async def list_statuses() -> BookStatusListResponse:
     """
     try:
         statuses = await get_all_book_statuses()
-        return BookStatusListResponse(
-            statuses=[
-                BookStatusResponse(
-                    openlibrary_work_key=s["openlibrary_work_key"],
-                    title=s["title"],
-                    author_name=s["author_name"],
-                    cover_url=s["cover_url"],
-                    first_publish_year=s["first_publish_year"],
-                    status=ReadingStatus(s["status"]),
-                    created_at=s["created_at"],
-                    updated_at=s["updated_at"],
-                )
-                for s in statuses
-            ]
-        )
+        return {"statuses": statuses}
     except DatabaseError as e:
         logger.error(f"Database error listing statuses: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/batch",
+    response_model=BookStatusListResponse,
+    summary="Set status for several books",
+    responses={
+        500: {"model": ErrorResponse, "description": "Database error"},
+    },
+)
+async def update_statuses_batch(request: BookStatusBatchRequest) -> dict[str, Any]:
+    """Set or update the reading status for several books in one transaction.
+
+    Each work key may appear only once; batches with duplicates are rejected with 422.
+
+    Args:
+        request: The books, each with its status and metadata
+
+    Returns:
+        BookStatusListResponse with the updated statuses and book metadata, in the
+        order the books were given
+    """
+    items = []
+    for book in request.books:
+        item = book.model_dump()
+        item["status"] = book.status.value
+        # Normalize key to always have leading slash, matching the single-book routes
+        if not item["openlibrary_work_key"].startswith("/"):
+            item["openlibrary_work_key"] = f"/{item['openlibrary_work_key']}"
+        items.append(item)
+
+    try:
+        statuses = await set_book_statuses_batch(items)
+        return {"statuses": statuses}
+    except DatabaseError as e:
+        logger.error(f"Database error setting statuses for {len(items)} books: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get(
-    "/{openlibrary_work_key:path}",
+    "/{openlibrary_work_key:work_key}",
     response_model=BookStatusResponse,
     responses={
         404: {"model": ErrorResponse, "description": "Book status not found"},
@@ -70,34 +117,24 @@ async def list_statuses() -> BookStatusListResponse:
 )
 async def get_status(
     openlibrary_work_key: str = Path(..., description="OpenLibrary work key"),
-) -> BookStatusResponse:
+) -> Response:
     """Get the reading status for a specific book.
 
+    The body is pre-serialized by the database layer, so it is returned as-is rather
+    than going through response_model.
+
     Args:
         openlibrary_work_key: The OpenLibrary work key (e.g., '/works/OL123W')
 
     Returns:
-        BookStatusResponse with the current status and book metadata
+        BookStatusResponse JSON with the current status and book metadata
     """
-    # Normalize key to always have leading slash (path converter strips it)
-    if not openlibrary_work_key.startswith("/"):
-        openlibrary_work_key = f"/{openlibrary_work_key}"
-
     try:
-        status = await get_book_status(openlibrary_work_key)
-        if not status:
+        status_json = await get_book_status_json(openlibrary_work_key)
+        if status_json is None:
             raise HTTPException(status_code=404, detail="Book status not found")
 
-        return BookStatusResponse(
-            openlibrary_work_key=status["openlibrary_work_key"],
-            title=status["title"],
-            author_name=status["author_name"],
-            cover_url=status["cover_url"],
-            first_publish_year=status["first_publish_year"],
-            status=ReadingStatus(status["status"]),
-            created_at=status["created_at"],
-            updated_at=status["updated_at"],
-        )
+        return Response(content=status_json, media_type="application/json")
     except HTTPException:
         raise
     except DatabaseError as e:
@@ -106,7 +143,7 @@ async def get_status(
 
 
 @router.put(
-    "/{openlibrary_work_key:path}",
+    "/{openlibrary_work_key:work_key}",
     response_model=BookStatusResponse,
     summary="Set book status",
     responses={
@@ -116,7 +153,7 @@ async def get_status(
 async def update_status(
     request: BookStatusRequest,
     openlibrary_work_key: str = Path(..., description="OpenLibrary work key"),
-) -> BookStatusResponse:
+) -> dict[str, Any]:
     """Set or update the reading status for a book.
 
     Args:
@@ -126,10 +163,6 @@ async def update_status(
     Returns:
         BookStatusResponse with the updated status and book metadata
     """
-    # Normalize key to always have leading slash (path converter strips it)
-    if not openlibrary_work_key.startswith("/"):
-        openlibrary_work_key = f"/{openlibrary_work_key}"
-
     try:
         status = await set_book_status(
             openlibrary_work_key=openlibrary_work_key,
@@ -140,23 +173,14 @@ async def update_status(
             first_publish_year=request.first_publish_year,
         )
 
-        return BookStatusResponse(
-            openlibrary_work_key=status["openlibrary_work_key"],
-            title=status["title"],
-            author_name=status["author_name"],
-            cover_url=status["cover_url"],
-            first_publish_year=status["first_publish_year"],
-            status=ReadingStatus(status["status"]),
-            created_at=status["created_at"],
-            updated_at=status["updated_at"],
-        )
+        return status
     except DatabaseError as e:
         logger.error(f"Database error setting status for {openlibrary_work_key}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.delete(
-    "/{openlibrary_work_key:path}",
+    "/{openlibrary_work_key:work_key}",
     status_code=204,
     responses={
         404: {"model": ErrorResponse, "description": "Book status not found"},
@@ -172,10 +196,6 @@ async def remove_status(
     Args:
         openlibrary_work_key: The OpenLibrary work key (e.g., '/works/OL123W')
     """
-    # Normalize key to always have leading slash (path converter strips it)
-    if not openlibrary_work_key.startswith("/"):
-        openlibrary_work_key = f"/{openlibrary_work_key}"
-
     try:
         deleted = await delete_book_status(openlibrary_work_key)
         if not deleted:
@@ -185,3 +205,13 @@ async def remove_status(
     except DatabaseError as e:
         logger.error(f"Database error deleting status for {openlibrary_work_key}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.api_route("/{path:path}", methods=["GET", "PUT", "DELETE"], include_in_schema=False)
+async def reject_malformed_key(path: str) -> None:
+    """Answer status requests whose path is not a work key with a JSON 404.
+
+    Without this, unmatched paths fall through to the SPA catch-all when the frontend
+    build is served, which answers GET with index.html and other methods with 405.
+    """
+    raise HTTPException(status_code=404, detail="Book status not found")
@@ -1,17 +1,93 @@
 """Cache service for storing and retrieving API responses."""
 
 import hashlib
-import json
-from datetime import datetime, timedelta, timezone
+import logging
+import os
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
-from api.database import get_db_connection
+import orjson
+
+from api.database import get_cached_search as get_cached_search_row
+from api.database import get_write_db
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Optional extra: pip install 'nee-reads[redis]'
+    aioredis = None
+
+logger = logging.getLogger(__name__)
 
 # Cache TTL in hours
 CACHE_TTL_HOURS = 24
 
+# Number of recent (query, page, limit) cache keys kept in memory
+CACHE_KEY_MEMO_SIZE = 4096
+
+# When set, search responses are cached in Redis instead of SQLite (e.g. redis://localhost:6379/0)
+REDIS_URL = os.environ.get("REDIS_URL")
+REDIS_KEY_PREFIX = "search:"
+
+# Per-worker cache in front of SQLite/Redis so popular searches skip the backend entirely.
+# Entries live at most MEMORY_CACHE_TTL_SECONDS, well under the backend TTL.
+MEMORY_CACHE_TTL_SECONDS = 3600.0
+MEMORY_CACHE_MAX_ENTRIES = 1000
+
+# Shared client created by init_cache_backend; None means the SQLite cache is used
+_redis: Optional[Any] = None
+
+# Statement text is kept in constants so every call hits the connection's statement cache
+# expires_at is unix seconds from SQLite's clock, the same one lookups and
+# clear_expired_cache compare against
+_SQL_STORE_CACHED = """
+    INSERT OR REPLACE INTO cachedb.search_cache
+    (query_hash, query, page, limit_val, response_json, expires_at)
+    VALUES (?, ?, ?, ?, ?, unixepoch() + ?)
+"""
+_SQL_DELETE_CACHED = "DELETE FROM cachedb.search_cache WHERE query_hash = ?"
+_SQL_CLEAR_CACHE = "DELETE FROM cachedb.search_cache"
+
+# Maps (backend, query hash) to the monotonic expiry time and the cached response
+_memory_cache: dict[tuple[str, str], tuple[float, dict[str, Any]]] = {}
+
+
+async def init_cache_backend(redis_url: Optional[str] = None) -> None:
+    """Connect to Redis if configured, otherwise keep using the SQLite cache.
+
+    Args:
+        redis_url: Redis URL to connect to, defaults to REDIS_URL
+
+    Raises:
+        RuntimeError: If a Redis URL is configured but the redis package is not installed
+    """
+    global _redis
+    redis_url = redis_url or REDIS_URL
+    if not redis_url:
+        return
+    if aioredis is None:
+        raise RuntimeError("REDIS_URL is set but the redis package is not installed")
+    _redis = aioredis.from_url(redis_url)
+    logger.info("Using Redis for the search cache")
+
+
+async def close_cache_backend() -> None:
+    """Close the Redis connection pool, if one was opened."""
+    global _redis
+    if _redis is not None:
+        client, _redis = _redis, None
+        await client.aclose()
+
+
+def _redis_key(query_hash: str) -> str:
+    """Build the Redis key for a cache entry."""
+    return f"{REDIS_KEY_PREFIX}{query_hash}"
 
+
+# Popular searches repeat, so memoize on the raw arguments and skip both the
+# normalization and the hash for them
+@lru_cache(maxsize=CACHE_KEY_MEMO_SIZE)
 def generate_cache_key(query: str, page: int, limit: int) -> str:
     """Generate a unique hash for the cache key."""
     normalized_query = query.strip().lower()
@@ -19,27 +95,72 @@ def generate_cache_key(query: str, page: int, limit: int) -> str:
     return hashlib.sha256(key_string.encode()).hexdigest()
 
 
+def _memory_key(query_hash: str, db_path: Optional[Path]) -> tuple[str, str]:
+    """Build the in-process cache key, scoped to the backend the entry came from."""
+    return ("redis" if _redis is not None else str(db_path), query_hash)
+
+
+def _remember(key: tuple[str, str], response: dict[str, Any]) -> None:
+    """Put a response in the in-process cache, evicting the oldest entries when full."""
+    # Re-insert so the dict stays ordered by insertion time for eviction
+    _memory_cache.pop(key, None)
+    _memory_cache[key] = (time.monotonic() + MEMORY_CACHE_TTL_SECONDS, response)
+    while len(_memory_cache) > MEMORY_CACHE_MAX_ENTRIES:
+        del _memory_cache[next(iter(_memory_cache))]
+
+
 async def get_cached_response(
     query: str, page: int, limit: int, db_path: Optional[Path] = None
 ) -> Optional[dict[str, Any]]:
     """Retrieve cached response if it exists and is not expired."""
-    query_hash = generate_cache_key(query, page, limit)
+    cached = await get_cached_search(query, page, limit, db_path)
+    return cached[0] if cached is not None else None
 
-    async with get_db_connection(db_path) as db:
-        db.row_factory = _dict_factory
-        cursor = await db.execute(
-            """
-            SELECT response_json FROM search_cache
-            WHERE query_hash = ? AND expires_at > datetime('now')
-            """,
-            (query_hash,),
-        )
-        row = await cursor.fetchone()
 
-        if row:
-            return json.loads(row["response_json"])
+async def get_cached_search(
+    query: str, page: int, limit: int, db_path: Optional[Path] = None
+) -> Optional[tuple[dict[str, Any], Optional[dict[str, str]]]]:
+    """Retrieve a cached response along with the saved statuses of its books, if known.
 
-    return None
+    A response read from SQLite comes back with its statuses from the same query. Responses
+    served from memory or Redis have None for statuses, so the caller still looks them up.
+
+    Returns:
+        Tuple of the cached response and its statuses (or None), or None on a cache miss
+    """
+    query_hash = generate_cache_key(query, page, limit)
+    key = _memory_key(query_hash, db_path)
+
+    if (entry := _memory_cache.get(key)) is not None:
+        expires, response = entry
+        if expires > time.monotonic():
+            return response, None
+        del _memory_cache[key]
+
+    cached = await _get_from_backend(query_hash, db_path)
+    if cached is not None:
+        _remember(key, cached[0])
+    return cached
+
+
+async def _get_from_backend(
+    query_hash: str, db_path: Optional[Path]
+) -> Optional[tuple[dict[str, Any], Optional[dict[str, str]]]]:
+    """Look up a cache entry in Redis or SQLite."""
+    if _redis is not None:
+        # Redis expires keys itself, so any value found is still fresh
+        try:
+            value = await _redis.get(_redis_key(query_hash))
+        except aioredis.RedisError as e:
+            logger.error(f"Redis error reading search cache: {e}")
+            return None
+        return (orjson.loads(value), None) if value is not None else None
+
+    row = await get_cached_search_row(query_hash, db_path)
+    if row is None:
+        return None
+    response_json, statuses = row
+    return orjson.loads(response_json), statuses
 
 
 async def store_cached_response(
@@ -51,17 +172,24 @@ async def store_cached_response(
 ) -> None:
     """Store a response in the cache."""
     query_hash = generate_cache_key(query, page, limit)
-    response_json = json.dumps(response)
-    expires_at = datetime.now(timezone.utc) + timedelta(hours=CACHE_TTL_HOURS)
+    _remember(_memory_key(query_hash, db_path), response)
+
+    if _redis is not None:
+        try:
+            await _redis.set(
+                _redis_key(query_hash), orjson.dumps(response), ex=CACHE_TTL_HOURS * 3600
+            )
+        except aioredis.RedisError as e:
+            logger.error(f"Redis error writing search cache: {e}")
+        return
+
+    # orjson's bytes are stored as-is; orjson.loads reads them back without a decode step
+    response_json = orjson.dumps(response)
 
-    async with get_db_connection(db_path) as db:
+    async with get_write_db(db_path) as db:
         await db.execute(
-            """
-            INSERT OR REPLACE INTO search_cache
-            (query_hash, query, page, limit_val, response_json, expires_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (query_hash, query, page, limit, response_json, expires_at.isoformat()),
+            _SQL_STORE_CACHED,
+            (query_hash, query, page, limit, response_json, CACHE_TTL_HOURS * 3600),
         )
         await db.commit()
 
@@ -71,22 +199,41 @@ async def invalidate_cache(
 ) -> bool:
     """Invalidate a specific cache entry. Returns True if entry was deleted."""
     query_hash = generate_cache_key(query, page, limit)
+    _memory_cache.pop(_memory_key(query_hash, db_path), None)
 
-    async with get_db_connection(db_path) as db:
-        cursor = await db.execute("DELETE FROM search_cache WHERE query_hash = ?", (query_hash,))
+    if _redis is not None:
+        try:
+            return await _redis.delete(_redis_key(query_hash)) > 0
+        except aioredis.RedisError as e:
+            logger.error(f"Redis error invalidating search cache: {e}")
+            return False
+
+    async with get_write_db(db_path) as db:
+        cursor = await db.execute(_SQL_DELETE_CACHED, (query_hash,))
         await db.commit()
         return cursor.rowcount > 0
 
 
 async def clear_all_cache(db_path: Optional[Path] = None) -> int:
     """Clear all cache entries. Returns number of entries deleted."""
-    async with get_db_connection(db_path) as db:
-        cursor = await db.execute("DELETE FROM search_cache")
+    _memory_cache.clear()
+    if _redis is not None:
+        # SCAN rather than KEYS so a large cache doesn't block the server
+        deleted = 0
+        batch: list[Any] = []
+        try:
+            async for key in _redis.scan_iter(match=f"{REDIS_KEY_PREFIX}*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    deleted += await _redis.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await _redis.unlink(*batch)
+        except aioredis.RedisError as e:
+            logger.error(f"Redis error clearing search cache after {deleted} keys: {e}")
+        return deleted
+
+    async with get_write_db(db_path) as db:
+        cursor = await db.execute(_SQL_CLEAR_CACHE)
         await db.commit()
         return cursor.rowcount
-
-
-def _dict_factory(cursor: Any, row: tuple) -> dict[str, Any]:
-    """Convert database row to dictionary."""
-    fields = [column[0] for column in cursor.description]
-    return dict(zip(fields, row))
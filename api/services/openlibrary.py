@@ -1,7 +1,10 @@
 """OpenLibrary API client service."""
 
+import os
+
 import httpx
-from typing import Any, Optional
+import orjson
+from typing import Any, Callable, Optional
 
 from api.models.schemas import Book, SearchResponse
 
@@ -11,6 +14,36 @@ OPENLIBRARY_COVER_URL = "https://covers.openlibrary.org/b"
 # Default timeout in seconds
 DEFAULT_TIMEOUT = 30.0
 
+# Doc fields used by parse_book_from_doc; everything else is dropped before caching
+SEARCH_FIELDS = ("key", "title", "author_name", "cover_i", "isbn", "first_publish_year")
+
+# Search results are parsed into Books and a SearchResponse without pydantic validation;
+# FastAPI still validates the response on the way out. Set NEE_READS_VALIDATE_DOCS=1 to
+# validate each book up front.
+VALIDATE_DOCS = os.environ.get("NEE_READS_VALIDATE_DOCS") == "1"
+
+# Connection pool limits for the shared client
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# Shared client, created on first use so its connections (and TLS sessions) are reused
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared OpenLibrary HTTP client, creating it if needed."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(http2=True, timeout=DEFAULT_TIMEOUT, limits=HTTP_LIMITS)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client, if one was created."""
+    global _http_client
+    if _http_client is not None:
+        client, _http_client = _http_client, None
+        await client.aclose()
+
 
 class OpenLibraryError(Exception):
     """Exception raised for OpenLibrary API errors."""
@@ -31,16 +64,42 @@ def build_cover_url(doc: dict[str, Any]) -> Optional[str]:
     if cover_i := doc.get("cover_i"):
         return f"{OPENLIBRARY_COVER_URL}/id/{cover_i}-L.jpg"
 
+    # A non-empty list is truthy, so the walrus check already guarantees a first ISBN
     if isbn_list := doc.get("isbn"):
-        if isbn_list and len(isbn_list) > 0:
-            return f"{OPENLIBRARY_COVER_URL}/isbn/{isbn_list[0]}-L.jpg"
+        return f"{OPENLIBRARY_COVER_URL}/isbn/{isbn_list[0]}-L.jpg"
 
     return None
 
 
-def parse_book_from_doc(doc: dict[str, Any]) -> Book:
-    """Parse an OpenLibrary document into a Book model."""
-    return Book(
+def project_doc(doc: dict[str, Any]) -> dict[str, Any]:
+    """Keep only the fields of an OpenLibrary doc that are used to build a Book.
+
+    Only the first ISBN is kept since it is all build_cover_url needs.
+    """
+    projected = {field: doc[field] for field in SEARCH_FIELDS if field in doc}
+    if isbn_list := projected.get("isbn"):
+        projected["isbn"] = isbn_list[:1]
+    return projected
+
+
+def project_search_response(raw_response: dict[str, Any]) -> dict[str, Any]:
+    """Reduce a raw search response to the minimal payload needed for parsing."""
+    return {
+        "numFound": raw_response.get("numFound", raw_response.get("num_found", 0)),
+        "docs": [project_doc(doc) for doc in raw_response.get("docs", [])],
+    }
+
+
+def parse_book_from_doc(doc: dict[str, Any], build: Optional[Callable[..., Book]] = None) -> Book:
+    """Parse an OpenLibrary document into a Book model.
+
+    Args:
+        doc: OpenLibrary search doc
+        build: Book constructor to use; defaults to one chosen by VALIDATE_DOCS
+    """
+    if build is None:
+        build = Book if VALIDATE_DOCS else Book.model_construct
+    return build(
         openlibrary_work_key=doc.get("key", ""),
         title=doc.get("title", "Unknown Title"),
         author_name=doc.get("author_name", []),
@@ -61,10 +120,10 @@ async def search_books(
         query: Search query string
         page: Page number (1-indexed)
         limit: Number of results per page
-        client: Optional httpx client for testing
+        client: httpx client to use, defaults to the shared client
 
     Returns:
-        Raw API response as dictionary
+        API response projected to the fields needed to build books
 
     Raises:
         OpenLibraryError: If API request fails
@@ -73,16 +132,16 @@ async def search_books(
         "q": query,
         "page": page,
         "limit": limit,
+        "fields": ",".join(SEARCH_FIELDS),
     }
 
-    should_close_client = client is None
     if client is None:
-        client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT)
+        client = get_http_client()
 
     try:
         response = await client.get(OPENLIBRARY_SEARCH_URL, params=params)
         response.raise_for_status()
-        return response.json()
+        return project_search_response(orjson.loads(response.content))
     except httpx.TimeoutException as e:
         raise OpenLibraryError("Request to OpenLibrary timed out") from e
     except httpx.HTTPStatusError as e:
@@ -92,9 +151,8 @@ async def search_books(
         ) from e
     except httpx.RequestError as e:
         raise OpenLibraryError(f"Failed to connect to OpenLibrary: {str(e)}") from e
-    finally:
-        if should_close_client:
-            await client.aclose()
+    except orjson.JSONDecodeError as e:
+        raise OpenLibraryError(f"OpenLibrary returned invalid JSON: {e}") from e
 
 
 def parse_search_response(raw_response: dict[str, Any], page: int, limit: int) -> SearchResponse:
@@ -111,10 +169,25 @@ def parse_search_response(raw_response: dict[str, Any], page: int, limit: int) -
     docs = raw_response.get("docs", [])
     total = raw_response.get("numFound", raw_response.get("num_found", 0))
 
-    books = [parse_book_from_doc(doc) for doc in docs]
+    # Pick the constructors once per page rather than once per doc
+    if VALIDATE_DOCS:
+        build_book, build_response = Book, SearchResponse
+    else:
+        build_book, build_response = Book.model_construct, SearchResponse.model_construct
+    # OpenLibrary occasionally repeats a work within a page; parse each key only once
+    parsed: dict[str, Book] = {}
+    books = []
+    for doc in docs:
+        key = doc.get("key")
+        book = parsed.get(key) if key else None
+        if book is None:
+            book = parse_book_from_doc(doc, build_book)
+            if key:
+                parsed[key] = book
+        books.append(book)
     total_pages = (total + limit - 1) // limit if limit > 0 else 0
 
-    return SearchResponse(
+    return build_response(
         books=books,
         total=total,
         page=page,
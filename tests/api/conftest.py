@@ -2,49 +2,37 @@
 
 import tempfile
 import os
+import shutil
+import uuid
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Iterator
 
+import aiosqlite
+import orjson
 import pytest
 import pytest_asyncio
+from fastapi import FastAPI
 from httpx import AsyncClient, ASGITransport
 
+from api import database
 from api.main import create_app
-from api.database import init_database
+from api.services import cache
+from api.database import (
+    ConnectionPool,
+    close_db_connections,
+    get_read_db,
+    init_database,
+)
+from api.services.cache import generate_cache_key
 
+# RAM-backed directory for test databases, where the platform has one
+RAM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else None
 
-@pytest.fixture
-def temp_db_path() -> Path:
-    """Create a temporary database path for testing."""
-    fd, path = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
-    yield Path(path)
-    # Cleanup
-    try:
-        os.unlink(path)
-    except OSError:
-        pass
-
-
-@pytest_asyncio.fixture
-async def initialized_db(temp_db_path: Path) -> AsyncGenerator[Path, None]:
-    """Initialize database and return the path."""
-    await init_database(temp_db_path)
-    yield temp_db_path
-
-
-@pytest_asyncio.fixture
-async def client() -> AsyncGenerator[AsyncClient, None]:
-    """Create an async test client for the FastAPI app."""
-    app = create_app()
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
-        yield ac
 
-
-@pytest.fixture
-def sample_openlibrary_response() -> dict:
-    """Sample OpenLibrary API response for testing."""
-    return {
+# Sample OpenLibrary API responses, serialized once. Each fixture below decodes a fresh
+# copy, so tests get plain dicts they can pass to orjson or mutate without sharing state.
+SAMPLE_OPENLIBRARY_RESPONSE = orjson.dumps(
+    {
         "numFound": 2,
         "start": 0,
         "docs": [
@@ -65,13 +53,171 @@ def sample_openlibrary_response() -> dict:
             },
         ],
     }
-
-
-@pytest.fixture
-def sample_openlibrary_empty_response() -> dict:
-    """Sample empty OpenLibrary API response for testing."""
-    return {
+)
+SAMPLE_OPENLIBRARY_EMPTY_RESPONSE = orjson.dumps(
+    {
         "numFound": 0,
         "start": 0,
         "docs": [],
     }
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _unsynchronized_test_connections() -> Iterator[None]:
+    """Open every test connection with synchronous=OFF so commits skip fsync.
+
+    synchronous is a per-connection setting, so it is swapped into CONNECTION_PRAGMAS
+    rather than set once after init_database. journal_mode stays WAL, which the pooled
+    readers and the PRAGMA tests depend on.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            database,
+            "CONNECTION_PRAGMAS",
+            tuple(
+                "PRAGMA synchronous = OFF" if pragma.startswith("PRAGMA synchronous") else pragma
+                for pragma in database.CONNECTION_PRAGMAS
+            ),
+        )
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_in_process_caches() -> Iterator[None]:
+    """Empty memoized and in-process caches after each test so state can't leak between tests."""
+    yield
+    generate_cache_key.cache_clear()
+    cache._memory_cache.clear()
+    database._miss_cache.clear()
+    database._status_json_cache.clear()
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _close_shared_connections() -> AsyncGenerator[None, None]:
+    """Close shared database connections opened during each test."""
+    yield
+    await close_db_connections()
+
+
+@pytest.fixture(scope="session")
+def test_db_dir(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """Create a directory for the session's test databases, in RAM when possible.
+
+    Test databases keep real files so WAL and auto-vacuum behave as in production, but
+    on tmpfs their writes and fsyncs never touch a disk. The whole directory, including
+    -wal and -shm files, is removed once at the end of the session.
+    """
+    if RAM_DIR is None:
+        # pytest reaps its own temporary directories
+        yield tmp_path_factory.mktemp("db")
+        return
+    # Name the directory after the xdist worker, if any, so parallel runs are easy to tell apart
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    directory = tempfile.mkdtemp(prefix=f"nee-reads-test-{worker}-", dir=RAM_DIR)
+    yield Path(directory)
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def temp_db_path(test_db_dir: Path) -> Path:
+    """Return a fresh database path for testing; the file is created on first connect."""
+    return test_db_dir / f"{uuid.uuid4().hex}.db"
+
+
+@pytest_asyncio.fixture(scope="session")
+async def template_db(test_db_dir: Path) -> Path:
+    """Initialize a database once per session for initialized_db to copy."""
+    path = test_db_dir / "template.db"
+    await init_database(path)
+    # Closing the last connection checkpoints the WAL, leaving one self-contained file
+    await close_db_connections()
+    return path
+
+
+@pytest_asyncio.fixture(scope="session")
+async def empty_db(test_db_dir: Path) -> Path:
+    """Initialize one empty database for the whole session, shared by read-only tests."""
+    path = test_db_dir / "empty.db"
+    await init_database(path)
+    await close_db_connections()
+    return path
+
+
+@pytest_asyncio.fixture(scope="session")
+async def schema_db(empty_db: Path) -> AsyncGenerator[aiosqlite.Connection, None]:
+    """Hold one connection to the empty database open for the whole session.
+
+    For tests that only inspect schema or connection settings, so they skip opening and
+    configuring a connection of their own. The pool is kept out of the shared registry,
+    so the per-test close leaves it alone. Tests must not write through it.
+    """
+    pool = ConnectionPool(empty_db)
+    await pool.open()
+    yield pool.writer
+    await pool.close()
+
+
+@pytest_asyncio.fixture
+async def readonly_db(
+    empty_db: Path, schema_db: aiosqlite.Connection
+) -> AsyncGenerator[Path, None]:
+    """Return the shared empty database, for tests that only read or miss.
+
+    Saves copying the template for tests that expect no rows. Since later tests rely on
+    it staying empty, the test fails if it leaves any book or cache row behind.
+    """
+    yield empty_db
+    cursor = await schema_db.execute(
+        """
+        SELECT (SELECT COUNT(*) FROM books) + (SELECT COUNT(*) FROM book_statuses)
+            + (SELECT COUNT(*) FROM cachedb.search_cache)
+        """
+    )
+    assert (await cursor.fetchone())[0] == 0, "readonly_db test wrote to the shared database"
+
+
+@pytest_asyncio.fixture
+async def initialized_db(temp_db_path: Path, template_db: Path) -> AsyncGenerator[Path, None]:
+    """Copy the initialized template database and return the path."""
+    shutil.copyfile(template_db, temp_db_path)
+    yield temp_db_path
+
+
+@pytest_asyncio.fixture
+async def read_db(initialized_db: Path) -> AsyncGenerator[aiosqlite.Connection, None]:
+    """Hold a pooled read-only connection to initialized_db for checking post-state.
+
+    The connection stays checked out for the whole test, so tests using it should only
+    read through it rather than through code that borrows another pooled reader.
+    """
+    async with get_read_db(initialized_db) as db:
+        yield db
+
+
+@pytest.fixture(scope="session")
+def app() -> FastAPI:
+    """Build the FastAPI app once for the whole test session."""
+    return create_app()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    """Create an async test client for the FastAPI app, shared by every test.
+
+    Route tests patch module globals per test, so sharing one client is safe.
+    """
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+def sample_openlibrary_response() -> dict[str, Any]:
+    """Sample OpenLibrary API response for testing."""
+    return orjson.loads(SAMPLE_OPENLIBRARY_RESPONSE)
+
+
+@pytest.fixture
+def sample_openlibrary_empty_response() -> dict[str, Any]:
+    """Sample empty OpenLibrary API response for testing."""
+    return orjson.loads(SAMPLE_OPENLIBRARY_EMPTY_RESPONSE)
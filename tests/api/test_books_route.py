@@ -1,230 +1,275 @@
 """Tests for books route."""
 
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator, Optional, Union
+
 import pytest
 from unittest.mock import patch, AsyncMock
-from httpx import AsyncClient
+from httpx import AsyncClient, Response
+from pydantic import ValidationError
 
+from api.database import DatabaseError
+from api.models.schemas import SearchParams
 from api.services.openlibrary import OpenLibraryError
 
 
+@pytest.fixture
+def books_mocks() -> Iterator[SimpleNamespace]:
+    """Patch the search route's cache, OpenLibrary and status dependencies at once.
+
+    Defaults to a cache miss with no saved statuses; tests set search results as needed.
+    """
+    mocks = SimpleNamespace(
+        cache_get=AsyncMock(return_value=None),
+        cache_store=AsyncMock(),
+        search=AsyncMock(),
+        statuses=AsyncMock(return_value={}),
+    )
+    with patch.multiple(
+        "api.routes.books",
+        get_cached_search=mocks.cache_get,
+        store_cached_response=mocks.cache_store,
+        search_books=mocks.search,
+        get_book_statuses_batch=mocks.statuses,
+    ):
+        yield mocks
+
+
+def _assert_search_results(response: Response) -> None:
+    """Check that both sample books come back."""
+    data = response.json()
+    assert len(data["books"]) == 2
+    assert data["total"] == 2
+
+
+def _assert_no_results(response: Response) -> None:
+    """Check that an empty search returns no books."""
+    data = response.json()
+    assert data["books"] == []
+    assert data["total"] == 0
+
+
+def _assert_pagination_info(response: Response) -> None:
+    """Check that pagination fields are present."""
+    data = response.json()
+    assert data["page"] == 1
+    assert "total_pages" in data
+    assert "total" in data
+
+
+def _assert_book_fields(response: Response) -> None:
+    """Check that each book carries the fields the frontend renders."""
+    book = response.json()["books"][0]
+    assert {
+        "openlibrary_work_key",
+        "title",
+        "author_name",
+        "cover_url",
+        "first_publish_year",
+        "status",
+    } <= book.keys()
+
+
+class TestSearchParams:
+    """Tests for SearchParams validation, without going through HTTP."""
+
+    def test_validates_empty_query(self) -> None:
+        """Test that empty query is rejected."""
+        with pytest.raises(ValidationError):
+            SearchParams(q="")
+
+    def test_validates_page_parameter(self) -> None:
+        """Test that page parameter must be positive."""
+        with pytest.raises(ValidationError):
+            SearchParams(q="test", page=0)
+        with pytest.raises(ValidationError):
+            SearchParams(q="test", page=-1)
+
+    def test_validates_limit_parameter(self) -> None:
+        """Test that limit parameter is validated."""
+        with pytest.raises(ValidationError):
+            SearchParams(q="test", limit=0)
+        with pytest.raises(ValidationError):
+            SearchParams(q="test", limit=101)
+
+    def test_defaults_page_and_limit(self) -> None:
+        """Test that page and limit default to the first full page."""
+        params = SearchParams(q="test")
+        assert (params.page, params.limit) == (1, 100)
+
+
 class TestSearchEndpoint:
     """Tests for /api/books/search endpoint."""
 
-    async def test_returns_search_results(
-        self, client: AsyncClient, sample_openlibrary_response: dict
+    @pytest.mark.parametrize(
+        ("search_result", "params", "expected_status", "assertions"),
+        [
+            pytest.param(
+                "sample_openlibrary_response",
+                {"q": "tolkien"},
+                200,
+                _assert_search_results,
+                id="results",
+            ),
+            pytest.param(
+                "sample_openlibrary_empty_response",
+                {"q": "nonexistent12345"},
+                200,
+                _assert_no_results,
+                id="no-results",
+            ),
+            pytest.param(
+                "sample_openlibrary_response",
+                {"q": "test", "page": 1, "limit": 100},
+                200,
+                _assert_pagination_info,
+                id="pagination-info",
+            ),
+            pytest.param(
+                "sample_openlibrary_response",
+                {"q": "test"},
+                200,
+                _assert_book_fields,
+                id="book-fields",
+            ),
+            pytest.param(
+                OpenLibraryError("Request timed out"),
+                {"q": "timeout"},
+                504,
+                None,
+                id="timeout",
+            ),
+            pytest.param(
+                OpenLibraryError("API Error", status_code=500),
+                {"q": "error"},
+                502,
+                None,
+                id="api-error",
+            ),
+        ],
+    )
+    async def test_search_endpoint(
+        self,
+        client: AsyncClient,
+        books_mocks: SimpleNamespace,
+        request: pytest.FixtureRequest,
+        search_result: Union[str, OpenLibraryError],
+        params: dict[str, Any],
+        expected_status: int,
+        assertions: Optional[Callable[[Response], None]],
     ) -> None:
-        """Test that search returns results from API."""
-        with (
-            patch("api.routes.books.get_cached_response", new_callable=AsyncMock) as mock_cache_get,
-            patch(
-                "api.routes.books.store_cached_response", new_callable=AsyncMock
-            ) as mock_cache_store,
-            patch("api.routes.books.search_books", new_callable=AsyncMock) as mock_search,
-            patch(
-                "api.routes.books.get_book_statuses_batch", new_callable=AsyncMock
-            ) as mock_statuses,
-        ):
-            mock_cache_get.return_value = None
-            mock_search.return_value = sample_openlibrary_response
-            mock_statuses.return_value = {}
-
-            response = await client.get("/api/books/search", params={"q": "tolkien"})
-
-            assert response.status_code == 200
-            data = response.json()
-            assert "books" in data
-            assert len(data["books"]) == 2
-            assert data["total"] == 2
+        """Test that a cache miss maps each OpenLibrary outcome to the expected response.
+
+        search_result is either the name of a sample response fixture or the error raised.
+        """
+        if isinstance(search_result, OpenLibraryError):
+            books_mocks.search.side_effect = search_result
+        else:
+            books_mocks.search.return_value = request.getfixturevalue(search_result)
+
+        response = await client.get("/api/books/search", params=params)
+
+        assert response.status_code == expected_status
+        if assertions is not None:
+            assertions(response)
 
     async def test_returns_cached_response(
-        self, client: AsyncClient, sample_openlibrary_response: dict
+        self,
+        client: AsyncClient,
+        books_mocks: SimpleNamespace,
+        sample_openlibrary_response: dict,
     ) -> None:
         """Test that cached response is returned when available."""
-        with (
-            patch("api.routes.books.get_cached_response", new_callable=AsyncMock) as mock_cache_get,
-            patch("api.routes.books.search_books", new_callable=AsyncMock) as mock_search,
-            patch(
-                "api.routes.books.get_book_statuses_batch", new_callable=AsyncMock
-            ) as mock_statuses,
-        ):
-            mock_cache_get.return_value = sample_openlibrary_response
-            mock_statuses.return_value = {}
+        books_mocks.cache_get.return_value = (sample_openlibrary_response, None)
+
+        response = await client.get("/api/books/search", params={"q": "cached"})
+
+        assert response.status_code == 200
+        books_mocks.search.assert_not_called()
+
+    async def test_uses_statuses_from_cache_hit(
+        self,
+        client: AsyncClient,
+        books_mocks: SimpleNamespace,
+        sample_openlibrary_response: dict,
+    ) -> None:
+        """Test that statuses returned with a cache hit skip the status lookup."""
+        work_key = sample_openlibrary_response["docs"][0]["key"]
+        books_mocks.cache_get.return_value = (sample_openlibrary_response, {work_key: "to_read"})
 
-            response = await client.get("/api/books/search", params={"q": "cached"})
+        response = await client.get("/api/books/search", params={"q": "cached"})
 
-            assert response.status_code == 200
-            mock_search.assert_not_called()
+        assert response.status_code == 200
+        assert response.json()["books"][0]["status"] == "to_read"
+        books_mocks.statuses.assert_not_called()
 
     async def test_stores_response_in_cache(
-        self, client: AsyncClient, sample_openlibrary_response: dict
+        self,
+        client: AsyncClient,
+        books_mocks: SimpleNamespace,
+        sample_openlibrary_response: dict,
     ) -> None:
         """Test that API response is stored in cache."""
-        with (
-            patch("api.routes.books.get_cached_response", new_callable=AsyncMock) as mock_cache_get,
-            patch(
-                "api.routes.books.store_cached_response", new_callable=AsyncMock
-            ) as mock_cache_store,
-            patch("api.routes.books.search_books", new_callable=AsyncMock) as mock_search,
-            patch(
-                "api.routes.books.get_book_statuses_batch", new_callable=AsyncMock
-            ) as mock_statuses,
-        ):
-            mock_cache_get.return_value = None
-            mock_search.return_value = sample_openlibrary_response
-            mock_statuses.return_value = {}
-
-            await client.get("/api/books/search", params={"q": "test"})
-
-            mock_cache_store.assert_called_once()
+        books_mocks.search.return_value = sample_openlibrary_response
 
-    async def test_requires_query_parameter(self, client: AsyncClient) -> None:
-        """Test that query parameter is required."""
-        response = await client.get("/api/books/search")
-        assert response.status_code == 422
+        await client.get("/api/books/search", params={"q": "test"})
 
-    async def test_validates_empty_query(self, client: AsyncClient) -> None:
-        """Test that empty query is rejected."""
-        response = await client.get("/api/books/search", params={"q": ""})
-        assert response.status_code == 422
+        books_mocks.cache_store.assert_called_once()
 
-    async def test_validates_page_parameter(self, client: AsyncClient) -> None:
-        """Test that page parameter must be positive."""
-        response = await client.get("/api/books/search", params={"q": "test", "page": 0})
-        assert response.status_code == 422
+    async def test_cache_store_failure_does_not_fail_search(
+        self,
+        client: AsyncClient,
+        books_mocks: SimpleNamespace,
+        sample_openlibrary_response: dict,
+    ) -> None:
+        """Test that a failed background cache store still returns results."""
+        books_mocks.cache_store.side_effect = DatabaseError("disk full")
+        books_mocks.search.return_value = sample_openlibrary_response
 
-        response = await client.get("/api/books/search", params={"q": "test", "page": -1})
-        assert response.status_code == 422
+        response = await client.get("/api/books/search", params={"q": "test"})
 
-    async def test_validates_limit_parameter(self, client: AsyncClient) -> None:
-        """Test that limit parameter is validated."""
-        response = await client.get("/api/books/search", params={"q": "test", "limit": 0})
+        assert response.status_code == 200
+        assert len(response.json()["books"]) == 2
+        books_mocks.cache_store.assert_called_once()
+
+    async def test_requires_query_parameter(self, client: AsyncClient) -> None:
+        """Test that query parameter is required."""
+        response = await client.get("/api/books/search")
         assert response.status_code == 422
 
-        response = await client.get("/api/books/search", params={"q": "test", "limit": 101})
+    async def test_rejects_invalid_parameters(self, client: AsyncClient) -> None:
+        """Test that invalid query parameters are rejected with 422."""
+        response = await client.get("/api/books/search", params={"q": "test", "page": 0})
         assert response.status_code == 422
 
     async def test_accepts_valid_pagination(
-        self, client: AsyncClient, sample_openlibrary_response: dict
+        self,
+        client: AsyncClient,
+        books_mocks: SimpleNamespace,
+        sample_openlibrary_response: dict,
     ) -> None:
         """Test that valid pagination parameters are accepted."""
-        with (
-            patch("api.routes.books.get_cached_response", new_callable=AsyncMock) as mock_cache_get,
-            patch("api.routes.books.store_cached_response", new_callable=AsyncMock),
-            patch("api.routes.books.search_books", new_callable=AsyncMock) as mock_search,
-            patch(
-                "api.routes.books.get_book_statuses_batch", new_callable=AsyncMock
-            ) as mock_statuses,
-        ):
-            mock_cache_get.return_value = None
-            mock_search.return_value = sample_openlibrary_response
-            mock_statuses.return_value = {}
-
-            response = await client.get(
-                "/api/books/search", params={"q": "test", "page": 2, "limit": 50}
-            )
-
-            assert response.status_code == 200
-            mock_search.assert_called_once_with("test", 2, 50)
-
-    async def test_returns_504_on_timeout(self, client: AsyncClient) -> None:
-        """Test that 504 is returned on API timeout."""
-        with (
-            patch("api.routes.books.get_cached_response", new_callable=AsyncMock) as mock_cache_get,
-            patch("api.routes.books.search_books", new_callable=AsyncMock) as mock_search,
-        ):
-            mock_cache_get.return_value = None
-            mock_search.side_effect = OpenLibraryError("Request timed out")
-
-            response = await client.get("/api/books/search", params={"q": "timeout"})
-
-            assert response.status_code == 504
-
-    async def test_returns_502_on_api_error(self, client: AsyncClient) -> None:
-        """Test that 502 is returned on API error."""
-        with (
-            patch("api.routes.books.get_cached_response", new_callable=AsyncMock) as mock_cache_get,
-            patch("api.routes.books.search_books", new_callable=AsyncMock) as mock_search,
-        ):
-            mock_cache_get.return_value = None
-            mock_search.side_effect = OpenLibraryError("API Error", status_code=500)
-
-            response = await client.get("/api/books/search", params={"q": "error"})
-
-            assert response.status_code == 502
-
-    async def test_returns_empty_books_for_no_results(
-        self, client: AsyncClient, sample_openlibrary_empty_response: dict
-    ) -> None:
-        """Test that empty books list is returned for no results."""
-        with (
-            patch("api.routes.books.get_cached_response", new_callable=AsyncMock) as mock_cache_get,
-            patch("api.routes.books.store_cached_response", new_callable=AsyncMock),
-            patch("api.routes.books.search_books", new_callable=AsyncMock) as mock_search,
-            patch(
-                "api.routes.books.get_book_statuses_batch", new_callable=AsyncMock
-            ) as mock_statuses,
-        ):
-            mock_cache_get.return_value = None
-            mock_search.return_value = sample_openlibrary_empty_response
-            mock_statuses.return_value = {}
-
-            response = await client.get("/api/books/search", params={"q": "nonexistent12345"})
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["books"] == []
-            assert data["total"] == 0
-
-    async def test_response_includes_pagination_info(
-        self, client: AsyncClient, sample_openlibrary_response: dict
-    ) -> None:
-        """Test that response includes pagination information."""
-        with (
-            patch("api.routes.books.get_cached_response", new_callable=AsyncMock) as mock_cache_get,
-            patch("api.routes.books.store_cached_response", new_callable=AsyncMock),
-            patch("api.routes.books.search_books", new_callable=AsyncMock) as mock_search,
-            patch(
-                "api.routes.books.get_book_statuses_batch", new_callable=AsyncMock
-            ) as mock_statuses,
-        ):
-            mock_cache_get.return_value = None
-            mock_search.return_value = sample_openlibrary_response
-            mock_statuses.return_value = {}
-
-            response = await client.get(
-                "/api/books/search", params={"q": "test", "page": 1, "limit": 100}
-            )
-
-            assert response.status_code == 200
-            data = response.json()
-            assert "page" in data
-            assert "total_pages" in data
-            assert "total" in data
-            assert data["page"] == 1
-
-    async def test_book_has_expected_fields(
-        self, client: AsyncClient, sample_openlibrary_response: dict
+        books_mocks.search.return_value = sample_openlibrary_response
+
+        response = await client.get(
+            "/api/books/search", params={"q": "test", "page": 2, "limit": 50}
+        )
+
+        assert response.status_code == 200
+        books_mocks.search.assert_called_once_with("test", 2, 50)
+
+    async def test_includes_saved_status(
+        self,
+        client: AsyncClient,
+        books_mocks: SimpleNamespace,
+        sample_openlibrary_response: dict,
     ) -> None:
-        """Test that books have expected fields."""
-        with (
-            patch("api.routes.books.get_cached_response", new_callable=AsyncMock) as mock_cache_get,
-            patch("api.routes.books.store_cached_response", new_callable=AsyncMock),
-            patch("api.routes.books.search_books", new_callable=AsyncMock) as mock_search,
-            patch(
-                "api.routes.books.get_book_statuses_batch", new_callable=AsyncMock
-            ) as mock_statuses,
-        ):
-            mock_cache_get.return_value = None
-            mock_search.return_value = sample_openlibrary_response
-            mock_statuses.return_value = {}
-
-            response = await client.get("/api/books/search", params={"q": "test"})
-
-            assert response.status_code == 200
-            book = response.json()["books"][0]
-            assert "openlibrary_work_key" in book
-            assert "title" in book
-            assert "author_name" in book
-            assert "cover_url" in book
-            assert "first_publish_year" in book
-            assert "status" in book
+        """Test that books with a saved status have it filled in."""
+        books_mocks.search.return_value = sample_openlibrary_response
+        books_mocks.statuses.return_value = {"/works/OL262758W": "completed"}
+
+        response = await client.get("/api/books/search", params={"q": "test"})
+
+        books = response.json()["books"]
+        assert books[0]["status"] is None
+        assert books[1]["status"] == "completed"
@@ -1,16 +1,50 @@
 """Tests for cache service."""
 
+import re
+import aiosqlite
+import orjson
 import pytest
 from pathlib import Path
+from typing import Any, AsyncIterator, Optional
 
+from api.services import cache
 from api.services.cache import (
+    CACHE_TTL_HOURS,
     generate_cache_key,
     get_cached_response,
+    get_cached_search,
     store_cached_response,
     invalidate_cache,
     clear_all_cache,
 )
-from api.database import get_db_connection
+from api.database import get_db_connection, set_book_status
+
+SHA256_HEX = re.compile(r"[0-9a-f]{64}")
+
+
+async def seed_cache(db_path: Path, entries: list[tuple[str, int, int, dict[str, Any]]]) -> None:
+    """Insert (query, page, limit, response) search cache rows in one transaction."""
+    params = [
+        (
+            generate_cache_key(query, page, limit),
+            query,
+            page,
+            limit,
+            orjson.dumps(response),
+            CACHE_TTL_HOURS * 3600,
+        )
+        for query, page, limit, response in entries
+    ]
+    async with get_db_connection(db_path) as db:
+        await db.executemany(
+            """
+            INSERT INTO search_cache
+            (query_hash, query, page, limit_val, response_json, expires_at)
+            VALUES (?, ?, ?, ?, ?, unixepoch() + ?)
+            """,
+            params,
+        )
+        await db.commit()
 
 
 class TestGenerateCacheKey:
@@ -46,39 +80,50 @@ class TestGenerateCacheKey:
         key2 = generate_cache_key("test", 1, 100)
         assert key1 != key2
 
+    def test_memoizes_repeated_queries(self) -> None:
+        """Test that repeated arguments are answered from the memo."""
+        generate_cache_key.cache_clear()
+        generate_cache_key("harry potter", 1, 100)
+        generate_cache_key("harry potter", 1, 100)
+        assert generate_cache_key.cache_info().hits == 1
+
     def test_returns_sha256_hex_string(self) -> None:
         """Test that the key is a valid SHA256 hex string."""
         key = generate_cache_key("test", 1, 100)
-        assert len(key) == 64  # SHA256 produces 64 hex characters
-        assert all(c in "0123456789abcdef" for c in key)
+        # SHA256 produces 64 lowercase hex characters
+        assert SHA256_HEX.fullmatch(key)
 
 
 class TestStoreCachedResponse:
     """Tests for store_cached_response function."""
 
-    async def test_stores_response(self, initialized_db: Path) -> None:
+    async def test_stores_response(
+        self, initialized_db: Path, read_db: aiosqlite.Connection
+    ) -> None:
         """Test that a response is stored in the cache."""
         response = {"numFound": 1, "docs": [{"title": "Test Book"}]}
         await store_cached_response("test query", 1, 100, response, initialized_db)
 
-        async with get_db_connection(initialized_db) as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM search_cache")
-            result = await cursor.fetchone()
-            assert result[0] == 1
+        cursor = await read_db.execute("SELECT COUNT(*) FROM search_cache")
+        result = await cursor.fetchone()
+        assert result[0] == 1
 
-    async def test_stores_with_correct_values(self, initialized_db: Path) -> None:
+    async def test_stores_with_correct_values(
+        self, initialized_db: Path, read_db: aiosqlite.Connection
+    ) -> None:
         """Test that stored values are correct."""
         response = {"numFound": 5, "docs": []}
         await store_cached_response("my query", 2, 50, response, initialized_db)
 
-        async with get_db_connection(initialized_db) as db:
-            cursor = await db.execute("SELECT query, page, limit_val FROM search_cache")
-            result = await cursor.fetchone()
-            assert result[0] == "my query"
-            assert result[1] == 2
-            assert result[2] == 50
+        cursor = await read_db.execute("SELECT query, page, limit_val FROM search_cache")
+        result = await cursor.fetchone()
+        assert result[0] == "my query"
+        assert result[1] == 2
+        assert result[2] == 50
 
-    async def test_replaces_existing_entry(self, initialized_db: Path) -> None:
+    async def test_replaces_existing_entry(
+        self, initialized_db: Path, read_db: aiosqlite.Connection
+    ) -> None:
         """Test that storing with same key replaces existing entry."""
         response1 = {"numFound": 1, "docs": []}
         response2 = {"numFound": 2, "docs": []}
@@ -86,10 +131,9 @@ class TestStoreCachedResponse:
         await store_cached_response("test", 1, 100, response1, initialized_db)
         await store_cached_response("test", 1, 100, response2, initialized_db)
 
-        async with get_db_connection(initialized_db) as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM search_cache")
-            result = await cursor.fetchone()
-            assert result[0] == 1
+        cursor = await read_db.execute("SELECT COUNT(*) FROM search_cache")
+        result = await cursor.fetchone()
+        assert result[0] == 1
 
 
 class TestGetCachedResponse:
@@ -103,6 +147,16 @@ class TestGetCachedResponse:
         result = await get_cached_response("test", 1, 100, initialized_db)
         assert result == response
 
+    async def test_round_trips_sample_response(
+        self, initialized_db: Path, sample_openlibrary_response: dict
+    ) -> None:
+        """Test that the sample OpenLibrary response can be stored and read back."""
+        await store_cached_response("tolkien", 1, 100, sample_openlibrary_response, initialized_db)
+        cache._memory_cache.clear()
+
+        result = await get_cached_response("tolkien", 1, 100, initialized_db)
+        assert result == sample_openlibrary_response
+
     async def test_returns_none_for_miss(self, initialized_db: Path) -> None:
         """Test that None is returned for cache miss."""
         result = await get_cached_response("nonexistent", 1, 100, initialized_db)
@@ -116,7 +170,7 @@ class TestGetCachedResponse:
                 """
                 INSERT INTO search_cache 
                 (query_hash, query, page, limit_val, response_json, expires_at)
-                VALUES (?, ?, ?, ?, ?, datetime('now', '-1 hour'))
+                VALUES (?, ?, ?, ?, ?, unixepoch() - 3600)
                 """,
                 (query_hash, "expired", 1, 100, '{"numFound": 0, "docs": []}'),
             )
@@ -125,6 +179,16 @@ class TestGetCachedResponse:
         result = await get_cached_response("expired", 1, 100, initialized_db)
         assert result is None
 
+    async def test_expires_after_ttl(
+        self, initialized_db: Path, read_db: aiosqlite.Connection
+    ) -> None:
+        """Test that stored entries expire CACHE_TTL_HOURS from now, in unix seconds."""
+        await store_cached_response("test", 1, 100, {}, initialized_db)
+
+        cursor = await read_db.execute("SELECT expires_at - unixepoch() FROM search_cache")
+        remaining = (await cursor.fetchone())[0]
+        assert CACHE_TTL_HOURS * 3600 - 5 <= remaining <= CACHE_TTL_HOURS * 3600
+
     async def test_case_insensitive_query(self, initialized_db: Path) -> None:
         """Test that query matching is case-insensitive."""
         response = {"numFound": 1, "docs": []}
@@ -133,22 +197,65 @@ class TestGetCachedResponse:
         result = await get_cached_response("test query", 1, 100, initialized_db)
         assert result == response
 
+    async def test_returns_statuses_with_sqlite_hit(self, initialized_db: Path) -> None:
+        """Test that a SQLite hit includes the saved statuses of its books."""
+        response = {"numFound": 2, "docs": [{"key": "/works/OL1W"}, {"key": "/works/OL2W"}]}
+        await store_cached_response("fused", 1, 100, response, initialized_db)
+        await set_book_status(
+            openlibrary_work_key="/works/OL2W",
+            status="completed",
+            title="Book Two",
+            author_name=[],
+            db_path=initialized_db,
+        )
+        cache._memory_cache.clear()
+
+        result = await get_cached_search("fused", 1, 100, initialized_db)
+        assert result == (response, {"/works/OL2W": "completed"})
+
+    async def test_serves_repeat_lookups_from_memory(self, initialized_db: Path) -> None:
+        """Test that a repeat lookup is answered without reading the backend."""
+        response = {"numFound": 1, "docs": []}
+        await store_cached_response("popular", 1, 100, response, initialized_db)
+
+        async with get_db_connection(initialized_db) as db:
+            await db.execute("DELETE FROM search_cache")
+            await db.commit()
+
+        result = await get_cached_response("popular", 1, 100, initialized_db)
+        assert result == response
+
+    async def test_memory_entries_expire(
+        self, initialized_db: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that expired in-process entries fall through to the backend."""
+        monkeypatch.setattr(cache, "MEMORY_CACHE_TTL_SECONDS", -1.0)
+        await store_cached_response("stale", 1, 100, {"numFound": 1}, initialized_db)
+
+        async with get_db_connection(initialized_db) as db:
+            await db.execute("DELETE FROM search_cache")
+            await db.commit()
+
+        assert await get_cached_response("stale", 1, 100, initialized_db) is None
+
 
 class TestInvalidateCache:
     """Tests for invalidate_cache function."""
 
-    async def test_removes_specific_entry(self, initialized_db: Path) -> None:
+    async def test_removes_specific_entry(
+        self,
+        initialized_db: Path,
+        read_db: aiosqlite.Connection,
+    ) -> None:
         """Test that specific entry is removed."""
-        await store_cached_response("test1", 1, 100, {}, initialized_db)
-        await store_cached_response("test2", 1, 100, {}, initialized_db)
+        await seed_cache(initialized_db, [("test1", 1, 100, {}), ("test2", 1, 100, {})])
 
         result = await invalidate_cache("test1", 1, 100, initialized_db)
         assert result is True
 
-        async with get_db_connection(initialized_db) as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM search_cache")
-            count = await cursor.fetchone()
-            assert count[0] == 1
+        cursor = await read_db.execute("SELECT COUNT(*) FROM search_cache")
+        count = await cursor.fetchone()
+        assert count[0] == 1
 
     async def test_returns_false_when_not_found(self, initialized_db: Path) -> None:
         """Test that False is returned when entry not found."""
@@ -159,21 +266,115 @@ class TestInvalidateCache:
 class TestClearAllCache:
     """Tests for clear_all_cache function."""
 
-    async def test_clears_all_entries(self, initialized_db: Path) -> None:
+    async def test_clears_all_entries(
+        self,
+        initialized_db: Path,
+        read_db: aiosqlite.Connection,
+    ) -> None:
         """Test that all entries are cleared."""
-        await store_cached_response("test1", 1, 100, {}, initialized_db)
-        await store_cached_response("test2", 1, 100, {}, initialized_db)
-        await store_cached_response("test3", 1, 100, {}, initialized_db)
+        await seed_cache(
+            initialized_db, [("test1", 1, 100, {}), ("test2", 1, 100, {}), ("test3", 1, 100, {})]
+        )
 
         deleted = await clear_all_cache(initialized_db)
         assert deleted == 3
 
-        async with get_db_connection(initialized_db) as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM search_cache")
-            count = await cursor.fetchone()
-            assert count[0] == 0
+        cursor = await read_db.execute("SELECT COUNT(*) FROM search_cache")
+        count = await cursor.fetchone()
+        assert count[0] == 0
 
     async def test_returns_zero_when_empty(self, initialized_db: Path) -> None:
         """Test that zero is returned when cache is empty."""
         deleted = await clear_all_cache(initialized_db)
         assert deleted == 0
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio client."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: bytes, ex: int) -> None:
+        self.data[key] = value
+        self.ttls[key] = ex
+
+    async def delete(self, *keys: str) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def unlink(self, *keys: str) -> int:
+        return await self.delete(*keys)
+
+    async def scan_iter(self, match: str, count: int) -> AsyncIterator[str]:
+        prefix = match.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> FakeRedis:
+    """Route the cache service to an in-memory fake Redis client."""
+    client = FakeRedis()
+    monkeypatch.setattr(cache, "_redis", client)
+    monkeypatch.setattr(cache, "_memory_cache", {})
+    return client
+
+
+class TestRedisBackend:
+    """Tests for the Redis-backed search cache."""
+
+    async def test_round_trips_response_with_ttl(
+        self, initialized_db: Path, read_db: aiosqlite.Connection, fake_redis: FakeRedis
+    ) -> None:
+        """Test that responses are stored in Redis with the cache TTL and read back."""
+        response = {"numFound": 1, "docs": [{"title": "Test"}]}
+        await store_cached_response("Test", 1, 100, response, initialized_db)
+
+        key = f"search:{generate_cache_key('test', 1, 100)}"
+        assert fake_redis.ttls[key] == CACHE_TTL_HOURS * 3600
+        assert await get_cached_response("test", 1, 100, initialized_db) == response
+
+        # Nothing is written to the SQLite cache
+        cursor = await read_db.execute("SELECT COUNT(*) FROM search_cache")
+        assert (await cursor.fetchone())[0] == 0
+
+    async def test_returns_none_on_miss(self, fake_redis: FakeRedis) -> None:
+        """Test that a missing key is a cache miss."""
+        assert await get_cached_response("missing", 1, 100) is None
+
+    async def test_invalidates_entry(self, fake_redis: FakeRedis) -> None:
+        """Test that invalidate_cache deletes the Redis key."""
+        await store_cached_response("test", 1, 100, {})
+
+        assert await invalidate_cache("test", 1, 100) is True
+        assert await invalidate_cache("test", 1, 100) is False
+
+    async def test_clears_only_search_keys(self, fake_redis: FakeRedis) -> None:
+        """Test that clear_all_cache removes every search key and nothing else."""
+        for i in range(1200):
+            await store_cached_response(f"query {i}", 1, 100, {})
+        fake_redis.data["other:key"] = b"1"
+
+        assert await clear_all_cache() == 1200
+        assert list(fake_redis.data) == ["other:key"]
+
+    async def test_logs_errors_on_invalidate_and_clear(
+        self, fake_redis: FakeRedis, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that Redis errors while invalidating or clearing are logged, not raised."""
+        redis = pytest.importorskip("redis")
+
+        async def fail(*args: object) -> int:
+            raise redis.ConnectionError("connection refused")
+
+        await store_cached_response("test", 1, 100, {})
+        monkeypatch.setattr(fake_redis, "delete", fail)
+        monkeypatch.setattr(fake_redis, "unlink", fail)
+
+        assert await invalidate_cache("test", 1, 100) is False
+        assert await clear_all_cache() == 0
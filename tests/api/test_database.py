@@ -1,108 +1,349 @@
 """Tests for database module."""
 
+import sqlite3
+import aiosqlite
+import orjson
 import pytest
+import pytest_asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator
 
 from api.database import (
+    DatabaseError,
+    ensure_database_directory,
+    close_db_connections,
     init_database,
     get_db_connection,
+    get_read_db,
+    checkpoint_wal,
+    db_checkouts,
+    incremental_vacuum,
     clear_expired_cache,
     get_book_status,
+    get_book_status_json,
     set_book_status,
+    set_book_statuses_batch,
     delete_book_status,
     get_all_book_statuses,
     get_book_statuses_batch,
     get_books_by_status,
     get_status_counts,
+    get_pool,
+    warm_read_pool,
 )
 
 
+async def seed_books(db_path: Path, entries: list[tuple[str, str]]) -> None:
+    """Save (work key, status) pairs as placeholder books in one transaction."""
+    await set_book_statuses_batch(
+        [
+            {
+                "openlibrary_work_key": work_key,
+                "status": status,
+                "title": f"Book {work_key}",
+                "author_name": ["Author"],
+            }
+            for work_key, status in entries
+        ],
+        db_path,
+    )
+
+
+@asynccontextmanager
+async def trace_reads(db_path: Path) -> AsyncIterator[list[str]]:
+    """Record the statements run on every pooled reader of db_path, whichever is borrowed."""
+    statements: list[str] = []
+    await warm_read_pool(db_path)
+    readers = list((await get_pool(db_path))._readers)
+    for db in readers:
+        await db.set_trace_callback(statements.append)
+    try:
+        yield statements
+    finally:
+        for db in readers:
+            await db.set_trace_callback(None)
+
+
+@pytest_asyncio.fixture(scope="module")
+async def schema_objects(schema_db: aiosqlite.Connection) -> set[tuple[str, str, str]]:
+    """Read every (database, type, name) schema entry of schema_db in one query."""
+    cursor = await schema_db.execute(
+        """
+        SELECT 'main', type, name FROM main.sqlite_master
+        UNION ALL
+        SELECT 'cachedb', type, name FROM cachedb.sqlite_master
+        """
+    )
+    return {tuple(row) for row in await cursor.fetchall()}
+
+
 class TestInitDatabase:
     """Tests for init_database function."""
 
-    async def test_creates_search_cache_table(self, temp_db_path: Path) -> None:
-        """Test that init_database creates the search_cache table."""
-        await init_database(temp_db_path)
+    @pytest.mark.parametrize(
+        ("database", "obj_type", "name"),
+        [
+            ("cachedb", "table", "search_cache"),
+            ("main", "table", "books"),
+            ("main", "table", "book_statuses"),
+            ("cachedb", "index", "idx_query_hash"),
+            ("cachedb", "index", "idx_expires_at"),
+            ("main", "index", "idx_book_statuses_status_recent"),
+            ("main", "index", "idx_book_statuses_recent"),
+        ],
+    )
+    def test_creates_schema_object(
+        self, schema_objects: set[tuple[str, str, str]], database: str, obj_type: str, name: str
+    ) -> None:
+        """Test that init_database creates each expected table and index."""
+        assert (database, obj_type, name) in schema_objects
+
+    async def test_search_cache_is_in_memory(
+        self, schema_db: aiosqlite.Connection, schema_objects: set[tuple[str, str, str]]
+    ) -> None:
+        """Test that search_cache lives in the attached in-memory database, not the file."""
+        cursor = await schema_db.execute(
+            "SELECT file FROM pragma_database_list WHERE name='cachedb'"
+        )
+        assert (await cursor.fetchone())[0] == ""
+        assert not any(
+            database == "main" and name == "search_cache" for database, _, name in schema_objects
+        )
 
-        async with get_db_connection(temp_db_path) as db:
-            cursor = await db.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='search_cache'"
+    async def test_search_cache_survives_reopen(self, initialized_db: Path) -> None:
+        """Test that reopened connections recreate the in-memory search_cache table."""
+        await close_db_connections()
+
+        async with get_db_connection(initialized_db) as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM cachedb.search_cache")
+            assert (await cursor.fetchone())[0] == 0
+
+    async def test_status_updated_index_serves_library_order(
+        self, schema_db: aiosqlite.Connection
+    ) -> None:
+        """Test that the composite status/updated_at index covers the library ordering."""
+        cursor = await schema_db.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT b.openlibrary_work_key FROM books b
+            JOIN book_statuses bs ON b.id = bs.book_id
+            WHERE bs.status = ? ORDER BY bs.updated_at DESC, bs.book_id DESC
+            """,
+            (0,),
+        )
+        plan = " ".join(row[-1] for row in await cursor.fetchall())
+        assert "idx_book_statuses_status_recent" in plan
+        assert "TEMP B-TREE" not in plan
+
+    async def test_recent_index_serves_full_library_order(
+        self, schema_db: aiosqlite.Connection
+    ) -> None:
+        """Test that listing every status streams from idx_book_statuses_recent without a sort."""
+        cursor = await schema_db.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT b.openlibrary_work_key FROM books b
+            JOIN book_statuses bs ON b.id = bs.book_id
+            ORDER BY bs.updated_at DESC, bs.book_id DESC
+            """
+        )
+        plan = " ".join(row[-1] for row in await cursor.fetchall())
+        assert "idx_book_statuses_recent" in plan
+        assert "TEMP B-TREE" not in plan
+
+    async def test_migrates_text_statuses(self, temp_db_path: Path) -> None:
+        """Test that a database with TEXT statuses is converted to integer codes."""
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.executescript(
+                """
+                CREATE TABLE books (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    openlibrary_work_key TEXT UNIQUE NOT NULL,
+                    title TEXT NOT NULL,
+                    author_name TEXT NOT NULL,
+                    cover_url TEXT,
+                    first_publish_year INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE TABLE book_statuses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    book_id INTEGER NOT NULL UNIQUE REFERENCES books(id) ON DELETE CASCADE,
+                    status TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                INSERT INTO books (id, openlibrary_work_key, title, author_name)
+                VALUES (1, '/works/OL1W', 'One', '[]'), (2, '/works/OL2W', 'Two', '[]');
+                INSERT INTO book_statuses (book_id, status)
+                VALUES (1, 'completed'), (2, 'did_not_finish');
+                """
             )
-            result = await cursor.fetchone()
-            assert result is not None
-            assert result[0] == "search_cache"
+        conn.close()
 
-    async def test_creates_books_table(self, temp_db_path: Path) -> None:
-        """Test that init_database creates the books table."""
         await init_database(temp_db_path)
 
         async with get_db_connection(temp_db_path) as db:
-            cursor = await db.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='books'"
-            )
-            result = await cursor.fetchone()
-            assert result is not None
-            assert result[0] == "books"
+            cursor = await db.execute("SELECT book_id, status FROM book_statuses ORDER BY book_id")
+            assert [tuple(row) for row in await cursor.fetchall()] == [(1, 2), (2, 1)]
+        assert (await get_book_status("/works/OL1W", temp_db_path))["status"] == "completed"
+        assert await get_status_counts(temp_db_path) == {
+            "to_read": 0,
+            "did_not_finish": 1,
+            "completed": 1,
+        }
+
+    async def test_enables_incremental_auto_vacuum(self, temp_db_path: Path) -> None:
+        """Test that init_database switches an existing database to incremental auto-vacuum."""
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.execute("CREATE TABLE legacy (x)")
+        conn.close()
 
-    async def test_creates_book_statuses_table(self, temp_db_path: Path) -> None:
-        """Test that init_database creates the book_statuses table."""
         await init_database(temp_db_path)
 
         async with get_db_connection(temp_db_path) as db:
-            cursor = await db.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='book_statuses'"
-            )
-            result = await cursor.fetchone()
-            assert result is not None
-            assert result[0] == "book_statuses"
+            cursor = await db.execute("PRAGMA auto_vacuum")
+            assert (await cursor.fetchone())[0] == 2
 
-    async def test_creates_query_hash_index(self, temp_db_path: Path) -> None:
-        """Test that init_database creates the query_hash index."""
-        await init_database(temp_db_path)
+    async def test_rejects_old_sqlite(
+        self, temp_db_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that init_database fails clearly on SQLite without unixepoch()."""
+        monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 37, 2))
 
-        async with get_db_connection(temp_db_path) as db:
-            cursor = await db.execute(
-                "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_query_hash'"
-            )
-            result = await cursor.fetchone()
-            assert result is not None
+        with pytest.raises(DatabaseError, match="3.38.0 or newer"):
+            await init_database(temp_db_path)
 
-    async def test_creates_expires_at_index(self, temp_db_path: Path) -> None:
-        """Test that init_database creates the expires_at index."""
-        await init_database(temp_db_path)
+        assert not temp_db_path.exists()
 
-        async with get_db_connection(temp_db_path) as db:
-            cursor = await db.execute(
-                "SELECT name FROM sqlite_master WHERE type='index' AND name='idx_expires_at'"
-            )
-            result = await cursor.fetchone()
-            assert result is not None
+    async def test_opens_path_with_uri_characters(self, temp_db_path: Path) -> None:
+        """Test that '?', '#' and '%' in the database path are not parsed as URI syntax."""
+        db_path = temp_db_path.with_name(f"odd?#%{temp_db_path.name}")
+
+        await init_database(db_path)
+
+        assert db_path.exists()
+        async with get_db_connection(db_path) as db:
+            cursor = await db.execute("SELECT count(*) FROM cachedb.search_cache")
+            assert (await cursor.fetchone())[0] == 0
 
-    async def test_idempotent_initialization(self, temp_db_path: Path) -> None:
+    async def test_idempotent_initialization(self, initialized_db: Path) -> None:
         """Test that init_database can be called multiple times without error."""
-        await init_database(temp_db_path)
-        await init_database(temp_db_path)  # Should not raise
+        # initialized_db is a copy of an already initialized template
+        await init_database(initialized_db)  # Should not raise
 
-        async with get_db_connection(temp_db_path) as db:
+        async with get_db_connection(initialized_db) as db:
             cursor = await db.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name='search_cache'"
+                "SELECT name FROM cachedb.sqlite_master WHERE type='table' AND name='search_cache'"
             )
             result = await cursor.fetchone()
             assert result is not None
 
 
+class TestEnsureDatabaseDirectory:
+    """Tests for ensure_database_directory function."""
+
+    def test_probes_each_directory_once(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that repeated checks of one directory only write the probe file once."""
+        touched = []
+        real_touch = Path.touch
+
+        def counting_touch(path: Path) -> None:
+            touched.append(path)
+            real_touch(path)
+
+        monkeypatch.setattr(Path, "touch", counting_touch)
+
+        ensure_database_directory(tmp_path / "data" / "a.db")
+        ensure_database_directory(tmp_path / "data" / "b.db")
+
+        assert (tmp_path / "data").is_dir()
+        assert len(touched) == 1
+
+
 class TestGetDbConnection:
     """Tests for get_db_connection function."""
 
-    async def test_returns_connection(self, temp_db_path: Path) -> None:
+    async def test_returns_connection(self, initialized_db: Path) -> None:
         """Test that get_db_connection returns a valid connection."""
-        await init_database(temp_db_path)
-        async with get_db_connection(temp_db_path) as db:
+        async with get_db_connection(initialized_db) as db:
             assert db is not None
             cursor = await db.execute("SELECT 1")
             result = await cursor.fetchone()
             assert result[0] == 1
 
+    async def test_enables_wal_and_foreign_keys(self, schema_db: aiosqlite.Connection) -> None:
+        """Test that connections are opened in WAL mode with foreign keys enforced."""
+        cursor = await schema_db.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+        cursor = await schema_db.execute("PRAGMA foreign_keys")
+        assert (await cursor.fetchone())[0] == 1
+
+    async def test_test_connections_skip_fsync(self, schema_db: aiosqlite.Connection) -> None:
+        """Test that the suite's connections run with synchronous=OFF but keep WAL."""
+        cursor = await schema_db.execute("PRAGMA synchronous")
+        assert (await cursor.fetchone())[0] == 0
+        cursor = await schema_db.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+
+    async def test_reuses_shared_connection(self, temp_db_path: Path) -> None:
+        """Test that repeated calls share one long-lived connection."""
+        async with get_db_connection(temp_db_path) as first:
+            pass
+        async with get_db_connection(temp_db_path) as second:
+            assert second is first
+
+    async def test_rolls_back_on_error(self, initialized_db: Path) -> None:
+        """Test that a failed block does not leave uncommitted writes behind."""
+        with pytest.raises(DatabaseError):
+            async with get_db_connection(initialized_db) as db:
+                await db.execute(
+                    "INSERT INTO books (openlibrary_work_key, title, author_name) VALUES (?, ?, ?)",
+                    ("/works/OL1W", "Book", "[]"),
+                )
+                raise RuntimeError("boom")
+
+        async with get_db_connection(initialized_db) as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM books")
+            assert (await cursor.fetchone())[0] == 0
+
+    async def test_read_connections_are_read_only(self, initialized_db: Path) -> None:
+        """Test that pooled read connections reject writes."""
+        with pytest.raises(DatabaseError):
+            async with get_read_db(initialized_db) as db:
+                await db.execute("DELETE FROM books")
+
+    async def test_warm_opens_full_read_pool(self, initialized_db: Path) -> None:
+        """Test that warm_read_pool opens every reader and reads reuse them."""
+        await warm_read_pool(initialized_db)
+        pool = await get_pool(initialized_db)
+        readers = list(pool._readers)
+        assert len(readers) == pool.read_pool_size
+
+        async with get_read_db(initialized_db) as db:
+            assert db in readers
+        assert len(pool._readers) == pool.read_pool_size
+
+    async def test_reads_see_committed_writes(self, initialized_db: Path) -> None:
+        """Test that read connections observe data committed by the writer."""
+        async with get_read_db(initialized_db) as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM books")
+            assert (await cursor.fetchone())[0] == 0
+
+        await set_book_status(
+            openlibrary_work_key="/works/OL1W",
+            status="to_read",
+            title="Book One",
+            author_name=["Author A"],
+            db_path=initialized_db,
+        )
+
+        async with get_read_db(initialized_db) as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM books")
+            assert (await cursor.fetchone())[0] == 1
+
 
 class TestClearExpiredCache:
     """Tests for clear_expired_cache function."""
@@ -110,23 +351,17 @@ class TestClearExpiredCache:
     async def test_removes_expired_entries(self, initialized_db: Path) -> None:
         """Test that expired entries are removed."""
         async with get_db_connection(initialized_db) as db:
-            # Insert an expired entry
-            await db.execute(
+            # One expired entry and one still valid, inserted in a single round trip
+            await db.executemany(
                 """
-                INSERT INTO search_cache 
+                INSERT INTO search_cache
                 (query_hash, query, page, limit_val, response_json, expires_at)
-                VALUES (?, ?, ?, ?, ?, datetime('now', '-1 hour'))
+                VALUES (?, ?, ?, ?, ?, unixepoch() + ?)
                 """,
-                ("hash1", "test", 1, 100, "{}"),
-            )
-            # Insert a valid entry
-            await db.execute(
-                """
-                INSERT INTO search_cache 
-                (query_hash, query, page, limit_val, response_json, expires_at)
-                VALUES (?, ?, ?, ?, ?, datetime('now', '+1 hour'))
-                """,
-                ("hash2", "test2", 1, 100, "{}"),
+                [
+                    ("hash1", "test", 1, 100, "{}", -3600),
+                    ("hash2", "test2", 1, 100, "{}", 3600),
+                ],
             )
             await db.commit()
 
@@ -138,12 +373,58 @@ class TestClearExpiredCache:
             result = await cursor.fetchone()
             assert result[0] == 1
 
-    async def test_returns_zero_when_no_expired(self, initialized_db: Path) -> None:
+    async def test_returns_zero_when_no_expired(self, readonly_db: Path) -> None:
         """Test that zero is returned when no expired entries exist."""
-        deleted = await clear_expired_cache(initialized_db)
+        deleted = await clear_expired_cache(readonly_db)
         assert deleted == 0
 
 
+class TestCheckpointWal:
+    """Tests for checkpoint_wal function."""
+
+    async def test_checkpoints_committed_writes(self, initialized_db: Path) -> None:
+        """Test that committed WAL frames are copied into the database file."""
+        await set_book_status(
+            openlibrary_work_key="/works/OL1W",
+            status="to_read",
+            title="Book One",
+            author_name=["Author A"],
+            db_path=initialized_db,
+        )
+
+        await checkpoint_wal(initialized_db)
+
+        async with get_db_connection(initialized_db) as db:
+            cursor = await db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            busy, log_frames, checkpointed = await cursor.fetchone()
+            assert busy == 0
+            assert checkpointed == log_frames
+
+
+class TestIncrementalVacuum:
+    """Tests for incremental_vacuum function."""
+
+    async def test_releases_free_pages(self, initialized_db: Path) -> None:
+        """Test that incremental_vacuum shrinks the freelist by at most the requested pages."""
+        async with get_db_connection(initialized_db) as db:
+            await db.executemany(
+                "INSERT INTO books (openlibrary_work_key, title, author_name) VALUES (?, ?, '[]')",
+                [(f"/works/OL{i}W", "x" * 500) for i in range(2000)],
+            )
+            await db.commit()
+            await db.execute("DELETE FROM books")
+            await db.commit()
+            cursor = await db.execute("PRAGMA freelist_count")
+            free_before = (await cursor.fetchone())[0]
+        assert free_before > 10
+
+        await incremental_vacuum(initialized_db, pages=10)
+
+        async with get_db_connection(initialized_db) as db:
+            cursor = await db.execute("PRAGMA freelist_count")
+            assert (await cursor.fetchone())[0] == free_before - 10
+
+
 class TestBookStatus:
     """Tests for book status operations."""
 
@@ -166,6 +447,67 @@ class TestBookStatus:
         assert result["cover_url"] == "https://example.com/cover.jpg"
         assert result["first_publish_year"] == 2020
 
+    async def test_status_json_tracks_writes(self, initialized_db: Path) -> None:
+        """Test that get_book_status_json reflects updates and deletes."""
+        assert await get_book_status_json("/works/OL123W", initialized_db) is None
+
+        await set_book_status(
+            openlibrary_work_key="/works/OL123W",
+            status="to_read",
+            title="Test Book",
+            author_name=["Author One"],
+            db_path=initialized_db,
+        )
+        data = orjson.loads(await get_book_status_json("/works/OL123W", initialized_db))
+        assert data == await get_book_status("/works/OL123W", initialized_db)
+
+        await set_book_status(
+            openlibrary_work_key="/works/OL123W",
+            status="completed",
+            title="Test Book",
+            author_name=["Author One"],
+            db_path=initialized_db,
+        )
+        data = orjson.loads(await get_book_status_json("/works/OL123W", initialized_db))
+        assert data["status"] == "completed"
+
+        await delete_book_status("/works/OL123W", initialized_db)
+        assert await get_book_status_json("/works/OL123W", initialized_db) is None
+
+    async def test_status_json_expires(
+        self, initialized_db: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that cached status JSON expires, so writes from other processes show up."""
+        await set_book_status(
+            openlibrary_work_key="/works/OL123W",
+            status="to_read",
+            title="Test Book",
+            author_name=["Author One"],
+            db_path=initialized_db,
+        )
+        # Simulate another process writing behind this process's cache
+        async with get_db_connection(initialized_db) as db:
+            await db.execute("UPDATE book_statuses SET status = 2")
+            await db.commit()
+
+        data = orjson.loads(await get_book_status_json("/works/OL123W", initialized_db))
+        assert data["status"] == "to_read"
+
+        monkeypatch.setattr("api.database.STATUS_JSON_CACHE_TTL_SECONDS", 0.0)
+        await set_book_status(
+            openlibrary_work_key="/works/OL456W",
+            status="to_read",
+            title="Other Book",
+            author_name=["Author Two"],
+            db_path=initialized_db,
+        )
+        async with get_db_connection(initialized_db) as db:
+            await db.execute("UPDATE book_statuses SET status = 2")
+            await db.commit()
+
+        data = orjson.loads(await get_book_status_json("/works/OL456W", initialized_db))
+        assert data["status"] == "completed"
+
     async def test_set_book_status_updates_existing(self, initialized_db: Path) -> None:
         """Test that set_book_status updates an existing status."""
         await set_book_status(
@@ -188,6 +530,106 @@ class TestBookStatus:
         assert result["title"] == "Test Book Updated"
         assert result["author_name"] == ["Author One", "New Author"]
 
+    async def test_set_book_status_keeps_created_at_on_update(self, initialized_db: Path) -> None:
+        """Test that updating a status returns the original created_at timestamp."""
+        first = await set_book_status(
+            openlibrary_work_key="/works/OL123W",
+            status="to_read",
+            title="Test Book",
+            author_name=["Author One"],
+            db_path=initialized_db,
+        )
+
+        second = await set_book_status(
+            openlibrary_work_key="/works/OL123W",
+            status="completed",
+            title="Test Book",
+            author_name=["Author One"],
+            db_path=initialized_db,
+        )
+
+        assert second["created_at"] == first["created_at"]
+        assert second["updated_at"] >= first["updated_at"]
+        assert "id" not in second
+
+    async def test_set_book_status_reads_row_back_in_one_statement(
+        self, initialized_db: Path
+    ) -> None:
+        """Test that the write returns the stored row without a follow-up SELECT."""
+        statements = []
+        async with get_db_connection(initialized_db) as db:
+            await db.set_trace_callback(statements.append)
+
+        result = await set_book_status(
+            openlibrary_work_key="/works/OL123W",
+            status="completed",
+            title="Test Book",
+            author_name=["Author One"],
+            db_path=initialized_db,
+        )
+
+        # Trigger bodies are traced too, but nothing should read the row back separately
+        assert not any(statement.lstrip().startswith("SELECT") for statement in statements)
+        assert result == await get_book_status("/works/OL123W", initialized_db)
+
+    async def test_set_book_statuses_batch(self, initialized_db: Path) -> None:
+        """Test that set_book_statuses_batch upserts several books at once."""
+        await set_book_status(
+            openlibrary_work_key="/works/OL1W",
+            status="to_read",
+            title="Book One",
+            author_name=["Author A"],
+            db_path=initialized_db,
+        )
+
+        results = await set_book_statuses_batch(
+            [
+                {
+                    "openlibrary_work_key": "/works/OL1W",
+                    "status": "completed",
+                    "title": "Book One",
+                    "author_name": ["Author A"],
+                },
+                {
+                    "openlibrary_work_key": "/works/OL2W",
+                    "status": "to_read",
+                    "title": "Book Two",
+                    "author_name": ["Author B", "Author C"],
+                    "cover_url": "https://example.com/cover.jpg",
+                    "first_publish_year": 1999,
+                },
+            ],
+            db_path=initialized_db,
+        )
+
+        by_key = {r["openlibrary_work_key"]: r for r in results}
+        assert by_key["/works/OL1W"]["status"] == "completed"
+        assert by_key["/works/OL2W"]["author_name"] == ["Author B", "Author C"]
+        assert by_key["/works/OL2W"]["first_publish_year"] == 1999
+        assert await get_status_counts(initialized_db) == {
+            "to_read": 1,
+            "did_not_finish": 0,
+            "completed": 1,
+        }
+
+    async def test_set_book_statuses_batch_keeps_input_order(self, initialized_db: Path) -> None:
+        """Test that set_book_statuses_batch returns rows in the order the keys were given."""
+        keys = ["/works/OL30W", "/works/OL4W", "/works/OL200W"]
+
+        results = await set_book_statuses_batch(
+            [
+                {"openlibrary_work_key": key, "status": "to_read", "title": key, "author_name": []}
+                for key in keys
+            ],
+            db_path=initialized_db,
+        )
+
+        assert [r["openlibrary_work_key"] for r in results] == keys
+
+    async def test_set_book_statuses_batch_empty(self, readonly_db: Path) -> None:
+        """Test that set_book_statuses_batch handles empty input."""
+        assert await set_book_statuses_batch([], readonly_db) == []
+
     async def test_get_book_status(self, initialized_db: Path) -> None:
         """Test that get_book_status retrieves a book status."""
         await set_book_status(
@@ -205,11 +647,65 @@ class TestBookStatus:
         assert result["status"] == "to_read"
         assert result["title"] == "Test Book"
 
-    async def test_get_book_status_not_found(self, initialized_db: Path) -> None:
+    async def test_get_book_status_not_found(self, readonly_db: Path) -> None:
         """Test that get_book_status returns None for non-existent book."""
-        result = await get_book_status("/works/NONEXISTENT", initialized_db)
+        result = await get_book_status("/works/NONEXISTENT", readonly_db)
         assert result is None
 
+    async def test_get_book_status_caches_misses(self, initialized_db: Path) -> None:
+        """Test that a miss is remembered until the status is written through the API."""
+        assert await get_book_status("/works/OL123W", initialized_db) is None
+
+        # Rows written behind the module's back are not seen while the miss is cached
+        async with get_db_connection(initialized_db) as db:
+            await db.execute(
+                "INSERT INTO books (id, openlibrary_work_key, title, author_name) "
+                "VALUES (1, '/works/OL123W', 'Test Book', '[]')"
+            )
+            await db.execute("INSERT INTO book_statuses (book_id, status) VALUES (1, 0)")
+            await db.commit()
+        assert await get_book_status("/works/OL123W", initialized_db) is None
+
+        await set_book_status(
+            openlibrary_work_key="/works/OL123W",
+            status="completed",
+            title="Test Book",
+            author_name=["Author One"],
+            db_path=initialized_db,
+        )
+        result = await get_book_status("/works/OL123W", initialized_db)
+        assert result is not None
+        assert result["status"] == "completed"
+
+    async def test_get_book_statuses_batch_caches_misses(self, initialized_db: Path) -> None:
+        """Test that keys absent from a batch lookup are remembered as misses."""
+        await get_book_statuses_batch(["/works/OL1W"], initialized_db)
+
+        async with get_db_connection(initialized_db) as db:
+            await db.execute(
+                "INSERT INTO books (id, openlibrary_work_key, title, author_name) "
+                "VALUES (1, '/works/OL1W', 'Book One', '[]')"
+            )
+            await db.execute("INSERT INTO book_statuses (book_id, status) VALUES (1, 0)")
+            await db.commit()
+
+        assert await get_book_status("/works/OL1W", initialized_db) is None
+
+    async def test_get_book_statuses_batch_skips_query_for_known_misses(
+        self, initialized_db: Path
+    ) -> None:
+        """Test that a batch of keys all cached as misses doesn't touch the database."""
+        keys = ["/works/OL1W", "/works/OL2W"]
+        await get_book_statuses_batch(keys, initialized_db)
+
+        counter = [0]
+        token = db_checkouts.set(counter)
+        try:
+            assert await get_book_statuses_batch(keys, initialized_db) == {}
+        finally:
+            db_checkouts.reset(token)
+        assert counter == [0]
+
     async def test_delete_book_status(self, initialized_db: Path) -> None:
         """Test that delete_book_status removes both status and book."""
         await set_book_status(
@@ -233,9 +729,9 @@ class TestBookStatus:
             count = await cursor.fetchone()
             assert count[0] == 0
 
-    async def test_delete_book_status_not_found(self, initialized_db: Path) -> None:
+    async def test_delete_book_status_not_found(self, readonly_db: Path) -> None:
         """Test that delete_book_status returns False for non-existent book."""
-        deleted = await delete_book_status("/works/NONEXISTENT", initialized_db)
+        deleted = await delete_book_status("/works/NONEXISTENT", readonly_db)
         assert deleted is False
 
     async def test_get_all_book_statuses(self, initialized_db: Path) -> None:
@@ -263,7 +759,21 @@ class TestBookStatus:
         assert results[1]["openlibrary_work_key"] == "/works/OL1W"
 
     async def test_get_book_statuses_batch(self, initialized_db: Path) -> None:
-        """Test that get_book_statuses_batch returns statuses for multiple books."""
+        """Test that get_book_statuses_batch returns statuses for multiple books in one query."""
+        await seed_books(initialized_db, [("/works/OL1W", "to_read"), ("/works/OL2W", "completed")])
+        async with trace_reads(initialized_db) as statements:
+            results = await get_book_statuses_batch(
+                ("/works/OL1W", "/works/OL2W", "/works/OL3W"), initialized_db
+            )
+
+        assert results == {
+            "/works/OL1W": "to_read",
+            "/works/OL2W": "completed",
+        }
+        assert len(statements) == 1
+
+    async def test_get_book_statuses_batch_large(self, initialized_db: Path) -> None:
+        """Test that batches larger than SQLite's bound-parameter limit work."""
         await set_book_status(
             openlibrary_work_key="/works/OL1W",
             status="to_read",
@@ -271,50 +781,22 @@ class TestBookStatus:
             author_name=["Author A"],
             db_path=initialized_db,
         )
-        await set_book_status(
-            openlibrary_work_key="/works/OL2W",
-            status="completed",
-            title="Book Two",
-            author_name=["Author B"],
-            db_path=initialized_db,
-        )
 
-        results = await get_book_statuses_batch(
-            ["/works/OL1W", "/works/OL2W", "/works/OL3W"], initialized_db
-        )
+        keys = [f"/works/OL{i}W" for i in range(1, 2001)]
+        results = await get_book_statuses_batch(keys, initialized_db)
 
-        assert results == {
-            "/works/OL1W": "to_read",
-            "/works/OL2W": "completed",
-        }
+        assert results == {"/works/OL1W": "to_read"}
 
-    async def test_get_book_statuses_batch_empty(self, initialized_db: Path) -> None:
+    async def test_get_book_statuses_batch_empty(self, readonly_db: Path) -> None:
         """Test that get_book_statuses_batch handles empty input."""
-        results = await get_book_statuses_batch([], initialized_db)
+        results = await get_book_statuses_batch([], readonly_db)
         assert results == {}
 
     async def test_get_books_by_status(self, initialized_db: Path) -> None:
         """Test that get_books_by_status returns books with specific status."""
-        await set_book_status(
-            openlibrary_work_key="/works/OL1W",
-            status="to_read",
-            title="Book One",
-            author_name=["Author A"],
-            db_path=initialized_db,
-        )
-        await set_book_status(
-            openlibrary_work_key="/works/OL2W",
-            status="completed",
-            title="Book Two",
-            author_name=["Author B"],
-            db_path=initialized_db,
-        )
-        await set_book_status(
-            openlibrary_work_key="/works/OL3W",
-            status="to_read",
-            title="Book Three",
-            author_name=["Author C"],
-            db_path=initialized_db,
+        await seed_books(
+            initialized_db,
+            [("/works/OL1W", "to_read"), ("/works/OL2W", "completed"), ("/works/OL3W", "to_read")],
         )
 
         results = await get_books_by_status("to_read", initialized_db)
@@ -324,46 +806,56 @@ class TestBookStatus:
         assert "/works/OL1W" in keys
         assert "/works/OL3W" in keys
 
-    async def test_get_books_by_status_empty(self, initialized_db: Path) -> None:
+    async def test_get_books_by_status_empty(self, readonly_db: Path) -> None:
         """Test that get_books_by_status returns empty list when no books match."""
-        results = await get_books_by_status("completed", initialized_db)
+        results = await get_books_by_status("completed", readonly_db)
         assert results == []
 
     async def test_get_status_counts(self, initialized_db: Path) -> None:
         """Test that get_status_counts returns correct counts for each status."""
+        await seed_books(
+            initialized_db,
+            [("/works/OL1W", "to_read"), ("/works/OL2W", "to_read"), ("/works/OL3W", "completed")],
+        )
+
+        counts = await get_status_counts(initialized_db)
+
+        assert counts == {
+            "to_read": 2,
+            "did_not_finish": 0,
+            "completed": 1,
+        }
+
+    async def test_get_status_counts_runs_one_query(self, readonly_db: Path) -> None:
+        """Test that every status count comes back from a single statement."""
+        async with trace_reads(readonly_db) as statements:
+            await get_status_counts(readonly_db)
+
+        assert len(statements) == 1
+
+    async def test_get_status_counts_tracks_updates_and_deletes(self, initialized_db: Path) -> None:
+        """Test that counts follow status changes and deletions."""
+        await seed_books(initialized_db, [("/works/OL1W", "to_read"), ("/works/OL2W", "to_read")])
         await set_book_status(
             openlibrary_work_key="/works/OL1W",
-            status="to_read",
+            status="completed",
             title="Book One",
             author_name=["Author A"],
             db_path=initialized_db,
         )
-        await set_book_status(
-            openlibrary_work_key="/works/OL2W",
-            status="to_read",
-            title="Book Two",
-            author_name=["Author B"],
-            db_path=initialized_db,
-        )
-        await set_book_status(
-            openlibrary_work_key="/works/OL3W",
-            status="completed",
-            title="Book Three",
-            author_name=["Author C"],
-            db_path=initialized_db,
-        )
+        await delete_book_status("/works/OL2W", initialized_db)
 
         counts = await get_status_counts(initialized_db)
 
         assert counts == {
-            "to_read": 2,
+            "to_read": 0,
             "did_not_finish": 0,
             "completed": 1,
         }
 
-    async def test_get_status_counts_empty(self, initialized_db: Path) -> None:
+    async def test_get_status_counts_empty(self, readonly_db: Path) -> None:
         """Test that get_status_counts returns zeros when no books exist."""
-        counts = await get_status_counts(initialized_db)
+        counts = await get_status_counts(readonly_db)
 
         assert counts == {
             "to_read": 0,
@@ -372,9 +864,46 @@ class TestBookStatus:
         }
 
     async def test_status_enum_constraint(self, initialized_db: Path) -> None:
-        """Test that invalid status values are rejected by the database."""
-        from api.database import DatabaseError
+        """Test that invalid status codes are rejected by the database."""
+        with pytest.raises(DatabaseError):
+            async with get_db_connection(initialized_db) as db:
+                await db.execute(
+                    "INSERT INTO books (id, openlibrary_work_key, title, author_name) "
+                    "VALUES (1, '/works/OL123W', 'Test Book', '[]')"
+                )
+                await db.execute("INSERT INTO book_statuses (book_id, status) VALUES (1, 3)")
+
+    async def test_rejects_invalid_status_before_writing(self, readonly_db: Path) -> None:
+        """Test that unknown statuses are rejected without touching the database."""
+        with pytest.raises(DatabaseError, match="invalid_status"):
+            await set_book_status(
+                openlibrary_work_key="/works/OL123W",
+                status="invalid_status",
+                title="Test Book",
+                author_name=["Author One"],
+                db_path=readonly_db,
+            )
+        with pytest.raises(DatabaseError):
+            await set_book_statuses_batch(
+                [
+                    {
+                        "openlibrary_work_key": "/works/OL1W",
+                        "status": "to_read",
+                        "title": "Book One",
+                        "author_name": [],
+                    },
+                    {
+                        "openlibrary_work_key": "/works/OL2W",
+                        "status": "invalid_status",
+                        "title": "Book Two",
+                        "author_name": [],
+                    },
+                ],
+                readonly_db,
+            )
 
+    async def test_rejected_status_leaves_no_book(self, initialized_db: Path) -> None:
+        """Test that a rejected status write does not leave the book row behind."""
         with pytest.raises(DatabaseError):
             await set_book_status(
                 openlibrary_work_key="/works/OL123W",
@@ -383,3 +912,7 @@ class TestBookStatus:
                 author_name=["Author One"],
                 db_path=initialized_db,
             )
+
+        async with get_db_connection(initialized_db) as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM books")
+            assert (await cursor.fetchone())[0] == 0
@@ -0,0 +1,35 @@
+"""Tests for library route."""
+
+from unittest.mock import AsyncMock, patch
+
+from httpx import AsyncClient
+
+from api.models.schemas import LibraryResponse
+
+
+class TestLibraryEndpoint:
+    """Tests for /api/library/{status} endpoint."""
+
+    async def test_returns_books_without_timestamps(self, client: AsyncClient) -> None:
+        """Test that library books match LibraryBook and omit status timestamps."""
+        row = {
+            "openlibrary_work_key": "/works/OL1W",
+            "title": "Book One",
+            "author_name": ["Author A"],
+            "cover_url": None,
+            "first_publish_year": 2001,
+            "status": "completed",
+            "created_at": "2024-01-01T00:00:00.000Z",
+            "updated_at": "2024-01-02T00:00:00.000Z",
+        }
+        with patch("api.routes.library.get_books_by_status", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = [row]
+
+            response = await client.get("/api/library/completed")
+
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] == 1
+            assert "created_at" not in data["books"][0]
+            assert LibraryResponse.model_validate(data).books[0].title == "Book One"
+            mock_get.assert_called_once_with("completed")
@@ -2,17 +2,22 @@
 
 import pytest
 import httpx
-from unittest.mock import AsyncMock, MagicMock
+import orjson
+from typing import Any, Optional
 
 from api.services.openlibrary import (
     build_cover_url,
+    close_http_client,
+    get_http_client,
     parse_book_from_doc,
     search_books,
     parse_search_response,
     OpenLibraryError,
     OPENLIBRARY_COVER_URL,
+    SEARCH_FIELDS,
 )
 from api.models.schemas import Book, SearchResponse
+from pydantic import ValidationError
 
 
 class TestBuildCoverUrl:
@@ -99,76 +104,112 @@ class TestParseBookFromDoc:
         assert isinstance(book, Book)
 
 
+class _StubClient:
+    """Stand-in for httpx.AsyncClient that records get() calls.
+
+    Returns a real httpx.Response built from status_code and body, or raises exc. Bodies
+    are encoded as JSON unless they are already bytes.
+    """
+
+    def __init__(
+        self, body: Any = None, status_code: int = 200, exc: Optional[Exception] = None
+    ) -> None:
+        self.body = body
+        self.status_code = status_code
+        self.exc = exc
+        self.calls: list[dict[str, Any]] = []
+
+    async def get(self, url: str, *, params: Optional[dict[str, Any]] = None) -> httpx.Response:
+        self.calls.append({"url": url, "params": params})
+        if self.exc is not None:
+            raise self.exc
+        return httpx.Response(
+            self.status_code,
+            content=self.body if isinstance(self.body, bytes) else orjson.dumps(self.body),
+            request=httpx.Request("GET", url),
+        )
+
+
 class TestSearchBooks:
     """Tests for search_books function."""
 
     async def test_makes_request_with_correct_params(self) -> None:
         """Test that request is made with correct parameters."""
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"numFound": 0, "docs": []}
-        mock_response.raise_for_status = MagicMock()
-
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.get.return_value = mock_response
+        client = _StubClient({"numFound": 0, "docs": []})
 
-        await search_books("test query", page=2, limit=50, client=mock_client)
+        await search_books("test query", page=2, limit=50, client=client)
 
-        mock_client.get.assert_called_once()
-        call_args = mock_client.get.call_args
-        assert call_args[1]["params"]["q"] == "test query"
-        assert call_args[1]["params"]["page"] == 2
-        assert call_args[1]["params"]["limit"] == 50
+        assert len(client.calls) == 1
+        params = client.calls[-1]["params"]
+        assert params["q"] == "test query"
+        assert params["page"] == 2
+        assert params["limit"] == 50
+        assert params["fields"] == ",".join(SEARCH_FIELDS)
 
     async def test_returns_json_response(self) -> None:
         """Test that JSON response is returned."""
         expected = {"numFound": 5, "docs": [{"title": "Book"}]}
+        client = _StubClient(expected)
 
-        mock_response = MagicMock()
-        mock_response.json.return_value = expected
-        mock_response.raise_for_status = MagicMock()
+        result = await search_books("test", client=client)
+        assert result == expected
 
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.get.return_value = mock_response
+    async def test_drops_unused_fields(self) -> None:
+        """Test that docs are reduced to the fields used for parsing."""
+        raw = {
+            "num_found": 1,
+            "start": 0,
+            "docs": [
+                {
+                    "key": "/works/OL1W",
+                    "title": "Book",
+                    "isbn": ["111", "222", "333"],
+                    "edition_count": 12,
+                    "subject": ["Fiction"],
+                }
+            ],
+        }
+        client = _StubClient(raw)
 
-        result = await search_books("test", client=mock_client)
-        assert result == expected
+        result = await search_books("test", client=client)
+        assert result == {
+            "numFound": 1,
+            "docs": [{"key": "/works/OL1W", "title": "Book", "isbn": ["111"]}],
+        }
+
+    async def test_raises_on_invalid_json(self) -> None:
+        """Test that a body that is not JSON raises OpenLibraryError instead of escaping."""
+        client = _StubClient(b"<html>Service Unavailable</html>")
+
+        with pytest.raises(OpenLibraryError) as exc_info:
+            await search_books("test", client=client)
+
+        assert "invalid json" in exc_info.value.message.lower()
 
     async def test_raises_on_timeout(self) -> None:
         """Test that OpenLibraryError is raised on timeout."""
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.get.side_effect = httpx.TimeoutException("Timeout")
+        client = _StubClient(exc=httpx.TimeoutException("Timeout"))
 
         with pytest.raises(OpenLibraryError) as exc_info:
-            await search_books("test", client=mock_client)
+            await search_books("test", client=client)
 
         assert "timed out" in exc_info.value.message.lower()
 
     async def test_raises_on_http_error(self) -> None:
         """Test that OpenLibraryError is raised on HTTP error."""
-        mock_request = MagicMock(spec=httpx.Request)
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-
-        http_error = httpx.HTTPStatusError(
-            "Server Error", request=mock_request, response=mock_response
-        )
-        mock_response.raise_for_status.side_effect = http_error
-
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.get.return_value = mock_response
+        client = _StubClient({"error": "Server Error"}, status_code=500)
 
         with pytest.raises(OpenLibraryError) as exc_info:
-            await search_books("test", client=mock_client)
+            await search_books("test", client=client)
 
         assert exc_info.value.status_code == 500
 
     async def test_raises_on_request_error(self) -> None:
         """Test that OpenLibraryError is raised on request error."""
-        mock_client = AsyncMock(spec=httpx.AsyncClient)
-        mock_client.get.side_effect = httpx.RequestError("Connection failed")
+        client = _StubClient(exc=httpx.RequestError("Connection failed"))
 
         with pytest.raises(OpenLibraryError) as exc_info:
-            await search_books("test", client=mock_client)
+            await search_books("test", client=client)
 
         assert "failed to connect" in exc_info.value.message.lower()
 
@@ -225,3 +266,41 @@ class TestParseSearchResponse:
         assert book.title == "The Lord of the Rings"
         assert book.author_name == ["J. R. R. Tolkien"]
         assert book.first_publish_year == 1954
+
+    def test_dedupes_by_key(self) -> None:
+        """Test that repeated work keys share one parsed Book, while keyless docs don't."""
+        doc = {"key": "/works/OL1W", "title": "Book"}
+        response = {"numFound": 4, "docs": [doc, dict(doc), {"title": "A"}, {"title": "B"}]}
+
+        books = parse_search_response(response, page=1, limit=100).books
+
+        assert len(books) == 4
+        assert books[0] is books[1]
+        assert books[2] is not books[3]
+
+    def test_validates_docs_when_enabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that VALIDATE_DOCS switches parsing to validating constructors."""
+        response = {"numFound": 1, "docs": [{"key": "/works/OL1W", "title": 123}]}
+
+        # Unvalidated parsing passes the bad title through as-is
+        assert parse_search_response(response, page=1, limit=100).books[0].title == 123
+
+        monkeypatch.setattr("api.services.openlibrary.VALIDATE_DOCS", True)
+        with pytest.raises(ValidationError):
+            parse_search_response(response, page=1, limit=100)
+
+
+class TestHttpClient:
+    """Tests for the shared OpenLibrary HTTP client."""
+
+    async def test_reuses_client_until_closed(self) -> None:
+        """Test that the same client is returned until close_http_client is called."""
+        client = get_http_client()
+        assert get_http_client() is client
+
+        await close_http_client()
+        assert client.is_closed
+
+        replacement = get_http_client()
+        assert replacement is not client
+        await close_http_client()
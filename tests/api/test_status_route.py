@@ -0,0 +1,124 @@
+"""Tests for status route."""
+
+from unittest.mock import AsyncMock, patch
+
+from httpx import AsyncClient
+
+
+class TestWorkKeyRouting:
+    """Tests for work key matching on /api/status/{key} routes."""
+
+    async def test_passes_key_with_leading_slash(self, client: AsyncClient) -> None:
+        """Test that a matched work key reaches the handler with its leading slash."""
+        with patch("api.routes.status.get_book_status_json", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = None
+
+            response = await client.get("/api/status/works/OL123W")
+
+            assert response.status_code == 404
+            mock_get.assert_called_once_with("/works/OL123W")
+
+    async def test_rejects_malformed_key(self, client: AsyncClient) -> None:
+        """Test that paths that are not work keys never reach the handler."""
+        with patch("api.routes.status.get_book_status_json", new_callable=AsyncMock) as mock_get:
+            response = await client.get("/api/status/books/OL123M")
+
+            assert response.status_code == 404
+            mock_get.assert_not_called()
+
+    async def test_rejects_malformed_key_on_writes(self, client: AsyncClient) -> None:
+        """Test that writes to paths that are not work keys get a JSON 404."""
+        with (
+            patch("api.routes.status.set_book_status", new_callable=AsyncMock) as mock_set,
+            patch("api.routes.status.delete_book_status", new_callable=AsyncMock) as mock_delete,
+        ):
+            put_response = await client.put(
+                "/api/status/works/OL123W/extra",
+                json={"status": "to_read", "title": "Dune", "author_name": []},
+            )
+            delete_response = await client.delete("/api/status/works/bad")
+
+            assert put_response.status_code == 404
+            assert put_response.json() == {"detail": "Book status not found"}
+            assert delete_response.status_code == 404
+            mock_set.assert_not_called()
+            mock_delete.assert_not_called()
+
+    async def test_batch_rejects_malformed_key(self, client: AsyncClient) -> None:
+        """Test that a batch containing a key that is not a work key is rejected."""
+        with patch(
+            "api.routes.status.set_book_statuses_batch", new_callable=AsyncMock
+        ) as mock_batch:
+            response = await client.post(
+                "/api/status/batch",
+                json={
+                    "books": [
+                        {
+                            "openlibrary_work_key": "/works/OL1W/extra",
+                            "status": "to_read",
+                            "title": "Dune",
+                            "author_name": [],
+                        }
+                    ]
+                },
+            )
+
+            assert response.status_code == 422
+            mock_batch.assert_not_called()
+
+    async def test_batch_sets_statuses(self, client: AsyncClient) -> None:
+        """Test that a batch normalizes keys and returns the stored statuses."""
+        stored = {
+            "openlibrary_work_key": "/works/OL2W",
+            "title": "Dune",
+            "author_name": ["Frank Herbert"],
+            "cover_url": None,
+            "first_publish_year": 1965,
+            "status": "completed",
+            "created_at": "2024-01-01 00:00:00",
+            "updated_at": "2024-01-01 00:00:00",
+        }
+        with patch(
+            "api.routes.status.set_book_statuses_batch", new_callable=AsyncMock
+        ) as mock_batch:
+            mock_batch.return_value = [stored]
+
+            response = await client.post(
+                "/api/status/batch",
+                json={
+                    "books": [
+                        {
+                            "openlibrary_work_key": "works/OL2W",
+                            "status": "completed",
+                            "title": "Dune",
+                            "author_name": ["Frank Herbert"],
+                            "first_publish_year": 1965,
+                        }
+                    ]
+                },
+            )
+
+            assert response.status_code == 200
+            assert response.json() == {"statuses": [stored]}
+            items = mock_batch.call_args.args[0]
+            assert [item["openlibrary_work_key"] for item in items] == ["/works/OL2W"]
+            assert items[0]["status"] == "completed"
+
+    async def test_batch_rejects_duplicate_keys(self, client: AsyncClient) -> None:
+        """Test that a batch listing the same work key twice is rejected."""
+        book = {"status": "to_read", "title": "Dune", "author_name": []}
+        with patch(
+            "api.routes.status.set_book_statuses_batch", new_callable=AsyncMock
+        ) as mock_batch:
+            response = await client.post(
+                "/api/status/batch",
+                json={
+                    "books": [
+                        {**book, "openlibrary_work_key": "works/OL2W"},
+                        {**book, "openlibrary_work_key": "/works/OL2W"},
+                    ]
+                },
+            )
+
+            assert response.status_code == 422
+            mock_batch.assert_not_called()
@@ -59,7 +59,7 @@ export async function getBookStatus(
   openlibraryWorkKey: string
 ): Promise<BookStatus | null> {
   // Don't encode - the key contains slashes (e.g., /works/OL123W) and the backend
-  // route uses {openlibrary_work_key:path} to handle this
+  // route matches it with a work_key converter (works/OL<digits>W)
   const response = await fetch(`${API_BASE_URL}/status${openlibraryWorkKey}`);
 
   if (response.status === 404) {
@@ -81,7 +81,7 @@ export async function setBookStatus(
   bookMetadata: BookMetadata
 ): Promise<BookStatus> {
   // Don't encode - the key contains slashes (e.g., /works/OL123W) and the backend
-  // route uses {openlibrary_work_key:path} to handle this
+  // route matches it with a work_key converter (works/OL<digits>W)
   const response = await fetch(`${API_BASE_URL}/status${openlibraryWorkKey}`, {
       method: 'PUT',
       headers: {
@@ -110,7 +110,7 @@ export async function deleteBookStatus(
   openlibraryWorkKey: string
 ): Promise<void> {
   // Don't encode - the key contains slashes (e.g., /works/OL123W) and the backend
-  // route uses {openlibrary_work_key:path} to handle this
+  // route matches it with a work_key converter (works/OL<digits>W)
   const response = await fetch(`${API_BASE_URL}/status${openlibraryWorkKey}`, {
     method: 'DELETE',
   });